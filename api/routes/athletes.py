@@ -1,19 +1,45 @@
-from fastapi import APIRouter, HTTPException
+import math
+import os
+from fastapi import APIRouter, HTTPException, Request
 from scrapers.getAthleteDetails import get_athlete_details
+from utils.cache_backend import cached_scrape
+from utils.common import BASE_URL
+from utils.http_cache import not_modified
 from utils.logging_config import get_logger
+from utils.roster_index import roster_index
+from utils.upstream import UpstreamUnavailable
 
 router = APIRouter()
-logger = get_logger(__name__, "api_athletes.log")
+logger = get_logger(__name__)
+
+# Seconds a scraped athlete page is served from the shared cache
+ATHLETE_CACHE_TTL = float(os.getenv("ATHLETE_CACHE_TTL", "3600"))
+
+def scrape_athlete(athlete_id: int):
+    """Scrape one athlete through the shared cache."""
+    url = f"{BASE_URL}/athletes/{athlete_id}"
+    return cached_scrape(f"athlete:{athlete_id}", ATHLETE_CACHE_TTL, get_athlete_details, url)
+
 
 @router.get("/{athlete_id}")
-def fetch_athlete(athlete_id: int):
+def fetch_athlete(athlete_id: int, request: Request):
     """Fetch detailed athlete data by ID."""
-    url = f"https://www.tfrrs.org/athletes/{athlete_id}"
+    if response := not_modified(request, f"athlete:{athlete_id}"):
+        return response
     try:
-        data = get_athlete_details(url)
+        data = scrape_athlete(athlete_id)
         if not data:
             raise HTTPException(status_code=404, detail="Athlete not found")
         return data
+    except UpstreamUnavailable as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": str(math.ceil(e.retry_after))})
     except Exception as e:
         logger.exception(f"Error fetching athlete {athlete_id}: {e}")
         raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/{athlete_id}/teams")
+def fetch_athlete_teams(athlete_id: int):
+    """List every team slug this athlete has appeared for (from the local roster index)."""
+    team_slugs = roster_index.teams_for_athlete(athlete_id)
+    return {"athlete_id": str(athlete_id), "count": len(team_slugs), "team_slugs": team_slugs}
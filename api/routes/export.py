@@ -0,0 +1,71 @@
+from datetime import date
+from functools import partial
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from api.routes.athletes import scrape_athlete
+from api.routes.meets import resolve_batch_meets, scrape_batch_meet
+from utils.export import EXPORT_FORMATS, export_athletes, export_meets
+from utils.logging_config import get_logger
+from utils.meet_batch import BATCH_CONCURRENCY
+
+router = APIRouter()
+logger = get_logger(__name__)
+
+FORMAT_QUERY = Query("parquet", regex="^(arrow|parquet|csv)$", description="arrow (IPC stream), parquet or csv")
+
+
+def _split_ids(ids: str | None) -> list:
+    return [i.strip() for i in (ids or "").split(",") if i.strip()]
+
+
+def _export_response(export, fmt: str, name: str) -> StreamingResponse:
+    try:
+        chunks = export()
+    except RuntimeError as e:  # pyarrow not installed
+        raise HTTPException(status_code=500, detail=str(e))
+    media_type, extension = EXPORT_FORMATS[fmt]
+    return StreamingResponse(
+        chunks, media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{name}.{extension}"'},
+    )
+
+
+@router.get("/meets")
+def export_meet_results(
+    meet_ids: str = Query(None, description="Comma-separated meet IDs (otherwise select like /meets/batch)"),
+    query: str = Query(None, description="Meet search query (searched live on TFRRS)"),
+    start_date: date = Query(None, description="Earliest meet date (YYYY-MM-DD), inclusive"),
+    end_date: date = Query(None, description="Latest meet date (YYYY-MM-DD), inclusive"),
+    sport: str = Query(None, regex="^(tf|xc)$", description="Sport of the given meet IDs (default tf), or filter"),
+    gender: str = Query("both", regex="^(m|f|both)$", description="Track meet gender: 'm', 'f' or 'both'"),
+    limit: int = Query(500, ge=1, le=5000, description="Maximum number of selected meets"),
+    concurrency: int = Query(BATCH_CONCURRENCY, ge=1, le=16, description="Meets scraped at once"),
+    format: str = FORMAT_QUERY,
+):
+    """
+    Meet results as one typed row per result (meet, event, round, heat,
+    wind, place, athlete, team, mark, mark_seconds), streamed in record
+    batches. Meets that fail to scrape are skipped (see the logs).
+    """
+    if ids := _split_ids(meet_ids):
+        if not all(i.isdigit() for i in ids):
+            raise HTTPException(status_code=400, detail="meet_ids must be comma-separated numeric IDs.")
+        meets = [{"meet_id": meet_id, "sport": sport or "tf"} for meet_id in ids[:limit]]
+    else:
+        meets = resolve_batch_meets(query, start_date, end_date, sport, limit)
+    export = partial(export_meets, meets, partial(scrape_batch_meet, gender=gender), format, concurrency)
+    return _export_response(export, format, "meet_results")
+
+
+@router.get("/athletes")
+def export_athlete_results(
+    athlete_ids: str = Query(..., description="Comma-separated athlete IDs"),
+    concurrency: int = Query(BATCH_CONCURRENCY, ge=1, le=16, description="Athletes scraped at once"),
+    format: str = FORMAT_QUERY,
+):
+    """Every result of the given athletes as one typed row per result, streamed in record batches."""
+    ids = _split_ids(athlete_ids)
+    if not ids or not all(i.isdigit() for i in ids):
+        raise HTTPException(status_code=400, detail="athlete_ids must be comma-separated numeric IDs.")
+    export = partial(export_athletes, [int(i) for i in ids], scrape_athlete, format, concurrency)
+    return _export_response(export, format, "athlete_results")
@@ -0,0 +1,162 @@
+from datetime import date
+from functools import partial
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+from api.routes.athletes import scrape_athlete
+from api.routes.meets import meet_cache_key, resolve_batch_meets, scrape_batch_meet, scrape_meet
+from api.routes.teams import scrape_team
+from utils.jobs import JobQueueFull, job_manager
+from utils.logging_config import get_logger
+from utils.meet_batch import BATCH_CONCURRENCY, collect_batch
+
+router = APIRouter()
+logger = get_logger(__name__)
+
+
+class JobRequest(BaseModel):
+    type: str
+    params: dict = {}
+
+
+# ---------- Job Types ---------- #
+# Each builder validates the params up front (so a bad request is a 400, not a
+# failed job) and returns the zero-argument callable the job worker runs.
+
+def _date_param(params: dict, name: str) -> date | None:
+    value = params.get(name)
+    if not value:
+        return None
+    try:
+        return date.fromisoformat(str(value))
+    except ValueError:
+        raise HTTPException(status_code=400, detail=f"{name} must be a YYYY-MM-DD date.")
+
+
+def build_meet_job(params: dict):
+    try:
+        meet_id = int(params["meet_id"])
+    except (KeyError, TypeError, ValueError):
+        raise HTTPException(status_code=400, detail="meet jobs need a numeric meet_id.")
+    sport, gender = params.get("sport", "tf"), params.get("gender")
+    if sport not in ("tf", "xc"):
+        raise HTTPException(status_code=400, detail="Invalid sport type. Must be 'tf' or 'xc'.")
+    meet_cache_key(meet_id, sport, gender)  # raises 400 for a bad gender
+    return partial(scrape_meet, meet_id, sport, gender)
+
+
+def build_athlete_job(params: dict):
+    try:
+        athlete_id = int(params["athlete_id"])
+    except (KeyError, TypeError, ValueError):
+        raise HTTPException(status_code=400, detail="athlete jobs need a numeric athlete_id.")
+    return partial(scrape_athlete, athlete_id)
+
+
+def build_team_job(params: dict):
+    if not params.get("team_slug"):
+        raise HTTPException(status_code=400, detail="team jobs need a team_slug.")
+    sport = params.get("sport", "tf")
+    if sport not in ("tf", "xc"):
+        raise HTTPException(status_code=400, detail="Invalid sport type. Must be 'tf' or 'xc'.")
+    return partial(scrape_team, params["team_slug"], sport)
+
+
+def build_batch_job(params: dict):
+    query = params.get("query")
+    start_date, end_date = _date_param(params, "start_date"), _date_param(params, "end_date")
+    sport, gender = params.get("sport"), params.get("gender", "both")
+    if sport not in (None, "tf", "xc"):
+        raise HTTPException(status_code=400, detail="Invalid sport type. Must be 'tf' or 'xc'.")
+    if gender not in ("m", "f", "both"):
+        raise HTTPException(status_code=400, detail="Gender must be 'm', 'f' or 'both'.")
+    if not query and not start_date and not end_date:
+        raise HTTPException(status_code=400, detail="Provide a query, a date range, or both.")
+    if start_date and end_date and start_date > end_date:
+        raise HTTPException(status_code=400, detail="start_date must not be after end_date.")
+    try:
+        limit = min(max(int(params.get("limit", 50)), 1), 500)
+        concurrency = min(max(int(params.get("concurrency", BATCH_CONCURRENCY)), 1), 16)
+    except (TypeError, ValueError):
+        raise HTTPException(status_code=400, detail="limit and concurrency must be integers.")
+
+    def run():
+        meets = resolve_batch_meets(query, start_date, end_date, sport, limit)
+        return collect_batch(meets, partial(scrape_batch_meet, gender=gender), concurrency)
+
+    return run
+
+
+JOB_TYPES = {
+    "meet": build_meet_job,
+    "athlete": build_athlete_job,
+    "team": build_team_job,
+    "batch": build_batch_job,
+}
+
+
+# ---------- Endpoints ---------- #
+
+def _get_job(job_id: str) -> dict:
+    job = job_manager.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found (unknown or expired)")
+    return job
+
+
+@router.post("/", status_code=202)
+def submit_job(request: JobRequest):
+    """
+    Start a scrape in the background and return its job record at once.
+    - `type` is `meet` (`meet_id`, `sport`, `gender` incl. `both`), `athlete`
+      (`athlete_id`), `team` (`team_slug`, `sport`) or `batch` (the
+      `/meets/batch` parameters: `query`, `start_date`, `end_date`, `sport`,
+      `gender`, `limit`, `concurrency`)
+    - Poll `GET /jobs/{id}` for status and progress, fetch the output from
+      `GET /jobs/{id}/result`, cancel with `DELETE /jobs/{id}`
+    """
+    build = JOB_TYPES.get(request.type)
+    if build is None:
+        raise HTTPException(status_code=400, detail=f"Unknown job type. Must be one of: {', '.join(JOB_TYPES)}.")
+    run = build(request.params)
+    try:
+        return job_manager.submit(request.type, request.params, run)
+    except JobQueueFull as e:
+        # Roughly how long until a slot frees up is unknowable; ask for a short back-off
+        raise HTTPException(status_code=503, detail=f"Job queue is full: {e}", headers={"Retry-After": "5"})
+
+
+@router.get("/{job_id}")
+def fetch_job(job_id: str):
+    """Job status (`queued`, `running`, `succeeded`, `failed`, `cancelled`), timestamps and progress counters."""
+    return _get_job(job_id)
+
+
+@router.get("/{job_id}/result")
+def fetch_job_result(job_id: str):
+    """
+    The job's output once it has succeeded. A job still queued or running
+    answers 202 with its status; a failed or cancelled one answers 409.
+    """
+    job = _get_job(job_id)
+    if job["status"] in ("queued", "running"):
+        return JSONResponse(job, status_code=202, headers={"Retry-After": "1"})
+    if job["status"] != "succeeded":
+        raise HTTPException(status_code=409, detail=f"Job {job['status']}: {job['error'] or 'no result'}")
+
+    result = job_manager.result(job_id)
+    if result is None:
+        raise HTTPException(status_code=404, detail="Job result expired")
+    return result
+
+
+@router.delete("/{job_id}")
+def cancel_job(job_id: str):
+    """
+    Cancel a job. A queued job is cancelled at once; a running one stops at
+    its next progress check, so its status may read `running` briefly.
+    """
+    job = job_manager.cancel(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found (unknown or expired)")
+    return job
@@ -0,0 +1,39 @@
+from fastapi import APIRouter, Query
+from utils.leaderboards import leaderboard_index
+
+router = APIRouter()
+
+
+@router.get("/")
+def list_leaderboards(
+    season: int = Query(None, description="Only boards for this season (year)"),
+    conference: str = Query(None, description="Only boards for this conference (default: all conferences combined)"),
+):
+    """List the available leaderboards (season, event, gender) and every known conference."""
+    boards = leaderboard_index.boards(season, conference)
+    return {"count": len(boards), "conferences": leaderboard_index.conferences(), "boards": boards}
+
+
+@router.get("/{event_name}")
+def fetch_leaderboard(
+    event_name: str,
+    gender: str = Query(..., regex="^(m|f)$"),
+    conference: str = Query(None, description="Conference name as on TFRRS (default: all conferences)"),
+    season: int = Query(None, description="Season (year); defaults to the latest one with marks"),
+    k: int = Query(25, ge=1, le=500, description="Number of athletes"),
+):
+    """
+    Top marks for one track event, from every meet already scraped.
+    - One row per athlete (their best mark), fastest first
+    - Conferences come from scraped team rosters, so a team only appears on
+      its conference board once its roster has been fetched
+    """
+    results = leaderboard_index.top(event_name, gender, conference, season, k)
+    return {
+        "event_name": event_name,
+        "gender": gender,
+        "conference": conference,
+        "season": results[0]["season"] if results else season,
+        "count": len(results),
+        "results": results,
+    }
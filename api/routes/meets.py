@@ -1,36 +1,171 @@
-from fastapi import APIRouter, HTTPException, Query
-from scrapers.getMeetDetails import get_meet_results
+import asyncio
+import math
+import os
+from datetime import date
+from functools import partial
+from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+from scrapers.getMeetDetails import get_combined_tf_results, get_meet_results
+from scrapers.getSearchResults import search_tfrrs
+from utils.cache_backend import cached_scrape
+from utils.common import BASE_URL
+from utils.http_cache import not_modified
 from utils.logging_config import get_logger
+from utils.meet_batch import BATCH_CONCURRENCY, collect_batch, iter_batch_ndjson, select_meets
+from utils.meet_watch import get_watcher, release_watcher
+from utils.search_index import search_index
+from utils.upstream import UpstreamUnavailable
 
 router = APIRouter()
-logger = get_logger(__name__, "api_meets.log")
+logger = get_logger(__name__)
+
+# Seconds a scraped meet is served from the shared cache
+MEET_CACHE_TTL = float(os.getenv("MEET_CACHE_TTL", "300"))
+
+# Seconds of silence before a keep-alive comment is sent on a watch stream
+WATCH_KEEPALIVE = 15
+
+
+def build_meet_url(meet_id: int, sport: str, gender: str | None) -> str:
+    """
+    Build the TFRRS results URL for a meet.
+    - Track meets use `/results/{meet_id}/{gender}`
+    - XC meets use `/results/xc/{meet_id}/m`
+    """
+    base_url = f"{BASE_URL}/results"
+
+    if sport == "xc":
+        return f"{base_url}/xc/{meet_id}/m"  # XC always uses /m
+    if gender not in ("m", "f"):
+        raise HTTPException(status_code=400, detail="Gender must be 'm' or 'f' for track meets.")
+    return f"{base_url}/{meet_id}/{gender}/"
+
+
+def meet_cache_key(meet_id, sport: str, gender: str | None) -> str:
+    """Shared cache key for a meet (validates sport/gender like `build_meet_url`)."""
+    if sport == "tf" and gender == "both":
+        return f"meet:{meet_id}:both"
+    return f"meet:{build_meet_url(meet_id, sport, gender)}"
+
+
+def scrape_meet(meet_id, sport: str, gender: str | None):
+    """Scrape one meet through the shared cache (`gender="both"` merges a track meet's two pages)."""
+    if sport == "tf" and gender == "both":
+        return cached_scrape(meet_cache_key(meet_id, sport, gender), MEET_CACHE_TTL, get_combined_tf_results, meet_id)
+    url = build_meet_url(meet_id, sport, gender)
+    return cached_scrape(meet_cache_key(meet_id, sport, gender), MEET_CACHE_TTL, get_meet_results, url)
+
+
+def scrape_batch_meet(meet: dict, gender: str):
+    """Scrape one meet selected by `select_meets` (`gender` only applies to track meets)."""
+    return scrape_meet(meet["meet_id"], meet["sport"], gender if meet["sport"] == "tf" else None)
+
+
+def resolve_batch_meets(query, start_date, end_date, sport, limit) -> list:
+    """Meets for a batch: a live meet search (or the local index without a query), filtered by date and sport."""
+    if not query and not start_date and not end_date:
+        raise HTTPException(status_code=400, detail="Provide a query, a date range, or both.")
+    if start_date and end_date and start_date > end_date:
+        raise HTTPException(status_code=400, detail="start_date must not be after end_date.")
+
+    try:
+        records = search_tfrrs("meet", query) if query else search_index.records("meet")
+    except Exception as e:
+        logger.exception(f"Meet batch search failed for '{query}': {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+    meets = select_meets(records, start_date, end_date, sport)[:limit]
+    logger.info(f"Meet batch: {len(meets)} meets for query={query!r} {start_date}..{end_date}")
+    return meets
+
+
+@router.get("/batch")
+def fetch_meet_batch(
+    query: str = Query(None, description="Meet search query (searched live on TFRRS)"),
+    start_date: date = Query(None, description="Earliest meet date (YYYY-MM-DD), inclusive"),
+    end_date: date = Query(None, description="Latest meet date (YYYY-MM-DD), inclusive"),
+    sport: str = Query(None, regex="^(tf|xc)$", description="Only 'tf' or 'xc' meets"),
+    gender: str = Query("both", regex="^(m|f|both)$", description="Track meet gender: 'm', 'f' or 'both'"),
+    limit: int = Query(50, ge=1, le=500, description="Maximum number of meets to scrape"),
+    concurrency: int = Query(BATCH_CONCURRENCY, ge=1, le=16, description="Meets scraped at once"),
+    stream: bool = Query(True, description="Stream NDJSON as meets finish instead of one JSON document"),
+):
+    """
+    Scrape every meet matching a search query and/or date range.
+    - With `query`, meets come from a live TFRRS meet search
+    - Without it, from every meet already in the local index
+    - Results stream as NDJSON: a `batch` line, one `meet` line per meet
+      (with `status` ok / not_found / error), then a `summary` line
+    """
+    meets = resolve_batch_meets(query, start_date, end_date, sport, limit)
+    scrape = partial(scrape_batch_meet, gender=gender)
+
+    if stream:
+        return StreamingResponse(iter_batch_ndjson(meets, scrape, concurrency), media_type="application/x-ndjson")
+    return collect_batch(meets, scrape, concurrency)
+
 
 @router.get("/{meet_id}")
 def fetch_meet(
+    request: Request,
     meet_id: int,
     sport: str = Query("tf", description="Sport type: 'tf' or 'xc'"),
-    gender: str = Query(None, description="Gender: 'm' or 'f' (only for track meets)"),
+    gender: str = Query(None, description="Gender: 'm', 'f' or 'both' (only for track meets)"),
 ):
     """
     Fetch all events and results for a meet.
     - Track meets use `/results/{meet_id}/{gender}`
+    - `gender=both` fetches the men's and women's pages concurrently and merges them
     - XC meets use `/results/xc/{meet_id}/m`
     """
-    base_url = "https://www.tfrrs.org/results"
-
-    # Build URL
-    if sport == "xc":
-        url = f"{base_url}/xc/{meet_id}/m"  # XC always uses /m
-    else:
-        if gender not in ("m", "f"):
-            raise HTTPException(status_code=400, detail="Gender must be 'm' or 'f' for track meets.")
-        url = f"{base_url}/{meet_id}/{gender}/"
+    cache_key = meet_cache_key(meet_id, sport, gender)
+    if response := not_modified(request, cache_key):
+        return response
 
     try:
-        data = get_meet_results(url)
+        data = scrape_meet(meet_id, sport, gender)
         if not data:
             raise HTTPException(status_code=404, detail="Meet not found")
         return data
+    except UpstreamUnavailable as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": str(math.ceil(e.retry_after))})
     except Exception as e:
         logger.exception(f"Error fetching {sport.upper()} {gender.upper() if gender else ''} meet {meet_id}: {e}")
         raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/{meet_id}/watch")
+async def watch_meet(
+    request: Request,
+    meet_id: int,
+    sport: str = Query("tf", description="Sport type: 'tf' or 'xc'"),
+    gender: str = Query(None, description="Gender: 'm' or 'f' (only for track meets)"),
+):
+    """
+    Stream live meet updates as Server-Sent Events.
+    - `snapshot`: the full meet on connect
+    - `update`: only events that are new or changed since the previous poll
+    - `error`: an upstream poll failed (the stream stays open)
+
+    All subscribers of the same meet share one server-side poll.
+    """
+    url = build_meet_url(meet_id, sport, gender)
+    watcher = get_watcher(url)
+    queue = watcher.subscribe()
+    logger.info(f"Watch subscriber joined {url} ({len(watcher.subscribers)} total)")
+
+    async def stream():
+        try:
+            while not await request.is_disconnected():
+                try:
+                    yield await asyncio.wait_for(queue.get(), timeout=WATCH_KEEPALIVE)
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+        finally:
+            release_watcher(watcher, queue)
+            logger.info(f"Watch subscriber left {url} ({len(watcher.subscribers)} remaining)")
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -1,16 +1,38 @@
 from fastapi import APIRouter, HTTPException, Query
 from scrapers.getSearchResults import search_tfrrs
 from utils.logging_config import get_logger
+from utils.search_index import is_confident_match, search_index
 
 router = APIRouter()
-logger = get_logger(__name__, "api_search.log")
+logger = get_logger(__name__)
 
 @router.get("/")
-def search(query_type: str = Query(..., regex="^(athlete|team|meet)$"), query: str = Query(...)):
-    """Search TFRRS for athletes, teams, or meets."""
+def search(
+    query_type: str = Query(..., regex="^(athlete|team|meet)$"),
+    query: str = Query(...),
+    live: bool = Query(False, description="Skip the local index and always search TFRRS"),
+    min_results: int = Query(1, ge=1, description="Fall back to TFRRS when the local index has fewer close matches"),
+):
+    """
+    Search for athletes, teams, or meets.
+    Answers from the local index of everything already scraped when it has
+    at least `min_results` close matches (names within about one typo per
+    five characters); otherwise, or with `live=true`, searches TFRRS.
+    """
+    local_results = []
+    if not live:
+        local_results = search_index.search(query_type, query)
+        confident = sum(is_confident_match(query_type, query, r) for r in local_results)
+        if confident >= min_results:
+            return {"count": len(local_results), "source": "local", "results": local_results}
+
     try:
         results = search_tfrrs(query_type, query)
-        return {"count": len(results), "results": results}
     except Exception as e:
         logger.exception(f"Search failed for {query_type}='{query}': {e}")
         raise HTTPException(status_code=500, detail=str(e))
+
+    if not results and local_results:
+        # Live search came back empty (or failed upstream); partial local matches beat nothing
+        return {"count": len(local_results), "source": "local", "results": local_results}
+    return {"count": len(results), "source": "live", "results": results}
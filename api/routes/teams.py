@@ -1,27 +1,53 @@
-from fastapi import APIRouter, HTTPException
+import math
+import os
+from fastapi import APIRouter, HTTPException, Request
 from scrapers.getTeamRoster import get_team_roster
+from utils.cache_backend import cached_scrape
+from utils.common import BASE_URL
+from utils.http_cache import not_modified
 from utils.logging_config import get_logger
+from utils.roster_index import roster_index
+from utils.upstream import UpstreamUnavailable
 
 router = APIRouter()
-logger = get_logger(__name__, "api_teams.log")
+logger = get_logger(__name__)
+
+# Seconds a scraped roster is served from the shared cache
+TEAM_CACHE_TTL = float(os.getenv("TEAM_CACHE_TTL", "3600"))
+
+def scrape_team(team_slug: str, sport: str = "tf"):
+    """Scrape one team roster through the shared cache."""
+    team_url = f"{BASE_URL}/teams/{sport}/{team_slug}.html"
+    logger.info(f"Fetching team roster: {team_url}")
+    return cached_scrape(f"team:{sport}:{team_slug}", TEAM_CACHE_TTL, get_team_roster, team_url)
+
 
 @router.get("/{team_slug}")
-def fetch_team(team_slug: str, sport: str = "tf"):
+def fetch_team(team_slug: str, request: Request, sport: str = "tf"):
     """Fetch team roster for either TF or XC."""
     try:
         # Build the correct TFRRS URL
         if sport not in ("tf", "xc"):
             raise HTTPException(status_code=400, detail="Invalid sport type. Must be 'tf' or 'xc'.")
 
-        team_url = f"https://www.tfrrs.org/teams/{sport}/{team_slug}.html"
-        logger.info(f"Fetching team roster: {team_url}")
+        if response := not_modified(request, f"team:{sport}:{team_slug}"):
+            return response
 
-        data = get_team_roster(team_url)
+        data = scrape_team(team_slug, sport)
         if not data:
             raise HTTPException(status_code=404, detail="Team not found")
 
         return data
 
+    except UpstreamUnavailable as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": str(math.ceil(e.retry_after))})
     except Exception as e:
         logger.exception(f"Error fetching team {team_slug}: {e}")
         raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/{team_slug}/athletes")
+def fetch_team_athletes(team_slug: str):
+    """List every athlete ID that has ever appeared for a team slug (from the local roster index)."""
+    athlete_ids = roster_index.athletes_for_team(team_slug)
+    return {"team_slug": team_slug, "count": len(athlete_ids), "athlete_ids": athlete_ids}
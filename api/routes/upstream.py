@@ -0,0 +1,14 @@
+from fastapi import APIRouter
+from utils.upstream import upstream_status
+
+router = APIRouter()
+
+
+@router.get("/status")
+def fetch_upstream_status():
+    """
+    Health of TFRRS as seen by this worker, per kind of page (meet, athlete, team):
+    circuit breaker state, recent p95 latency, the current hedge delay, and
+    how often hedged duplicate fetches won.
+    """
+    return upstream_status()
@@ -0,0 +1,81 @@
+"""
+Decode-path benchmark on multi-megabyte meet pages.
+
+Compares the previous decode (`gzip.decompress` attempted on an already
+decompressed body, exception, decode to str, parse the str) with
+`response_markup` (trust transport decompression, detect charset once,
+hand bytes to lxml). Responses are simulated the way `requests` returns
+them: body already decompressed, `Content-Encoding: gzip` still set.
+
+    python benchmarks/decode_path.py [--repeat 5]
+"""
+import argparse
+import gzip
+import os
+import sys
+import timeit
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fixtures import build_meet_html
+from utils.common import make_soup, response_markup
+
+
+class FakeResponse:
+    def __init__(self, content):
+        self.content = content
+        self.headers = {"Content-Encoding": "gzip", "Content-Type": "text/html; charset=utf-8"}
+
+
+def legacy_decode(r):
+    """The decode path the scrapers used before `response_markup`."""
+    try:
+        return gzip.decompress(r.content).decode("utf-8", errors="replace")
+    except Exception:
+        return r.content.decode("utf-8", errors="replace")
+
+
+def legacy_soup(r):
+    return make_soup(legacy_decode(r))
+
+
+def bytes_soup(r):
+    markup, charset = response_markup(r)
+    return make_soup(markup, charset)
+
+
+def peak_memory(fn, r):
+    tracemalloc.start()
+    fn(r)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    for events in (80, 400):
+        # Accented names make the str copy wider than the bytes (as on real pages)
+        html = build_meet_html(events=events, rows=40).replace("Synthetic", "Synthétic")
+        r = FakeResponse(html.encode("utf-8"))
+        size_mb = len(r.content) / 1e6
+
+        decode_old = min(timeit.repeat(lambda: legacy_decode(r), number=1, repeat=args.repeat))
+        decode_new = min(timeit.repeat(lambda: response_markup(r), number=1, repeat=args.repeat))
+        mem_old = peak_memory(legacy_decode, r)
+        mem_new = peak_memory(response_markup, r)
+        soup_old = min(timeit.repeat(lambda: legacy_soup(r), number=1, repeat=args.repeat))
+        soup_new = min(timeit.repeat(lambda: bytes_soup(r), number=1, repeat=args.repeat))
+
+        print(f"{size_mb:.1f} MB page")
+        print(f"  decode layer : legacy {decode_old * 1e6:7.0f} us, {mem_old / 1e6:5.1f} MB extra | "
+              f"bytes {decode_new * 1e6:7.0f} us, {mem_new / 1e6:5.1f} MB extra")
+        print(f"  decode+parse : legacy {soup_old * 1000:7.0f} ms              | bytes {soup_new * 1000:7.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+"""
+Synthetic TFRRS pages for benchmarks.
+
+The markup mirrors the structure the scrapers select on (panel headings,
+`custom-table-title` event blocks with hidden split columns, athlete
+`#meet-results` tables), so parse cost is representative without
+shipping recorded pages.
+"""
+import random
+
+TRACK_EVENTS = ["100 Meters", "200 Meters", "400 Meters", "800 Meters", "1500 Meters", "5000 Meters",
+                "10000 Meters", "110 Hurdles", "400 Hurdles", "3000 Steeplechase"]
+# Excluded by the scrapers (relays and field events) -- exercise the skip paths
+SKIPPED_EVENTS = ["4 x 100 Relay", "High Jump", "Pole Vault", "Shot Put", "Javelin"]
+
+FIRST_NAMES = ["Nico", "Parker", "Drew", "Abdi", "Katelyn", "Maria", "Jordan", "Taylor", "Morgan", "Alex"]
+LAST_NAMES = ["Young", "Wolfe", "Bosley", "Nur", "Tuohy", "Coogan", "Hocker", "Fisher", "Kiptoo", "Mills"]
+
+
+def _mark(rng, event_index):
+    base = [10.2, 20.5, 46.0, 108.0, 225.0, 820.0, 1700.0, 13.8, 50.5, 520.0][event_index % 10]
+    seconds = base * rng.uniform(1.0, 1.15)
+    minutes, secs = divmod(seconds, 60)
+    return f"{int(minutes)}:{secs:05.2f}" if minutes else f"{secs:.2f}"
+
+
+def build_meet_html(events: int = 40, rows: int = 40, seed: int = 0) -> str:
+    """A track meet results page with `events` event blocks of `rows` results each."""
+    rng = random.Random(seed)
+    parts = [
+        "<html><head><meta charset='utf-8'></head><body>",
+        "<div class='panel-body'><style>.split-hidden { display: none; }</style></div>",
+        "<h3 class='panel-title'>Synthetic Invitational</h3>",
+        "<div class='panel-heading-normal-text inline-block'>April 12, 2025</div>",
+        "<div class='panel-heading-normal-text inline-block'>Flagstaff, AZ</div>",
+    ]
+    names = TRACK_EVENTS + SKIPPED_EVENTS
+    for e in range(events):
+        event_name = names[e % len(names)]
+        uid = 3200000 + e
+        parts.append(
+            f"<div class='col-lg-12'><div class='custom-table-title'><h3>{event_name}</h3>"
+            f"<span class='wind-text'>W: {rng.uniform(-2, 2):.1f}</span></div>"
+            "<table class='table-hover'><thead><tr><th>PL</th><th>NAME</th><th>YEAR</th>"
+            "<th>TEAM</th><th>SPLIT</th><th>TIME</th></tr></thead><tbody>"
+        )
+        for r in range(rows):
+            athlete_id = 7000000 + e * rows + r
+            first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+            team = f"AZ_college_m_Team_{rng.randint(1, 60)}"
+            parts.append(
+                f"<tr><td>{r + 1}</td>"
+                f"<td><a href='https://www.tfrrs.org/athletes/{athlete_id}/Team/{first}_{last}.html'>{last}, {first}</a></td>"
+                f"<td>SR-4</td>"
+                f"<td><a href='https://www.tfrrs.org/teams/tf/{team}.html'>{team.replace('_', ' ')}</a></td>"
+                f"<td class='split-hidden'>{_mark(rng, e)}</td>"
+                f"<td class='heat_4_1_{uid}_{r}'>{_mark(rng, e)}</td></tr>"
+            )
+        parts.append("</tbody></table></div>")
+    parts.append("</body></html>")
+    return "".join(parts)
+
+
+def build_athlete_html(meets: int = 60, rows: int = 6, seed: int = 0) -> str:
+    """An athlete page with `meets` result tables of `rows` performances each."""
+    rng = random.Random(seed)
+    parts = [
+        "<html><head><meta charset='utf-8'></head><body>",
+        "<h3 class='panel-title large-title'>NICO YOUNG (SR-4)</h3>",
+        "<a href='https://www.tfrrs.org/teams/tf/AZ_college_m_Northern_Arizona.html'>"
+        "<h3 class='panel-title'>Northern Arizona</h3></a>",
+        "<div id='meet-results'>",
+    ]
+    names = TRACK_EVENTS + SKIPPED_EVENTS
+    for m in range(meets):
+        meet_id = 90000 + m
+        parts.append(
+            "<table class='table-hover'><thead><tr><th colspan='3'>"
+            f"<a href='https://www.tfrrs.org/results/{meet_id}/Meet_{m}'>Meet {m}</a>"
+            f"<span>Apr {1 + m % 28}, 2025</span></th></tr></thead><tbody>"
+        )
+        for r in range(rows):
+            event_name = names[(m + r) % len(names)]
+            parts.append(
+                f"<tr><td>{event_name}</td><td>{_mark(rng, r)}</td>"
+                f"<td><a href='https://www.tfrrs.org/results/{meet_id}/{5000 + r}/'>{r + 1}th (F)</a></td></tr>"
+            )
+        parts.append("</tbody></table>")
+    parts.append("</div></body></html>")
+    return "".join(parts)
+
+
+def build_team_html(athletes: int = 40, seed: int = 0) -> str:
+    """A team roster page with `athletes` rows."""
+    rng = random.Random(seed)
+    parts = [
+        "<html><head><meta charset='utf-8'></head><body>",
+        f"<h3 class='panel-title large-title'>Synthetic College {seed}</h3>",
+        "<div class='panel-second-title'><a href='https://www.tfrrs.org/leagues/49.html'>Big Sky</a>"
+        "<a href='https://www.tfrrs.org/leagues/1.html'>Mountain Region</a></div>",
+        "<table class='tablesaw'><thead><tr><th>NAME</th><th>YEAR</th></tr></thead><tbody>",
+    ]
+    for a in range(athletes):
+        athlete_id = 7000000 + seed * 1000 + a
+        first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+        parts.append(
+            f"<tr><td><a href='https://www.tfrrs.org/athletes/{athlete_id}/Team/{first}_{last}.html'>"
+            f"{last}, {first}</a></td><td>{rng.choice(['FR-1', 'SO-2', 'JR-3', 'SR-4'])}</td></tr>"
+        )
+    parts.append("</tbody></table></body></html>")
+    return "".join(parts)
+
+
+def build_home_html(token: str = "synthetic-token") -> str:
+    """The TFRRS homepage, as far as the search CSRF token lookup is concerned."""
+    return (
+        "<html><head><meta charset='utf-8'></head><body><form action='/search.html' method='post'>"
+        f"<input type='hidden' name='authenticity_token' value='{token}'></form></body></html>"
+    )
+
+
+def build_search_html(query_type: str, rows: int = 20, seed: int = 0) -> str:
+    """A `#myTable` search results page for `query_type` athlete, team or meet."""
+    rng = random.Random(seed)
+    parts = ["<html><head><meta charset='utf-8'></head><body><table id='myTable'><tbody>"]
+    for r in range(rows):
+        first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+        team = f"AZ_college_m_Team_{rng.randint(1, 60)}"
+        if query_type == "athlete":
+            cells = (
+                f"<td id='col0'><a href='https://www.tfrrs.org/athletes/{7000000 + r}/Team/{first}_{last}.html'>"
+                f"{first} {last}</a></td>"
+                f"<td id='col1'><a href='https://www.tfrrs.org/teams/tf/{team}.html'>{team.replace('_', ' ')}</a></td>"
+            )
+        elif query_type == "team":
+            cells = (
+                f"<td id='col0'><a href='https://www.tfrrs.org/teams/tf/{team}.html'>{team.replace('_', ' ')}</a></td>"
+                "<td>Track &amp; Field</td><td>Men</td>"
+            )
+        else:
+            cells = (
+                f"<td id='col0'><a href='https://www.tfrrs.org/results/{90000 + r}/Synthetic_Invitational_{r}'>"
+                f"Synthetic Invitational {r}</a></td>"
+                f"<td>Apr {1 + r % 28}, 2025</td><td>{rng.choice(['Outdoor', 'Indoor', 'XC'])}</td>"
+            )
+        parts.append(f"<tr>{cells}</tr>")
+    parts.append("</tbody></table></body></html>")
+    return "".join(parts)
@@ -0,0 +1,201 @@
+"""
+Upstream transport benchmark: per-call `requests.get` vs the shared HTTP/2 client.
+
+Starts a local TLS stub server (self-signed certificate made with the
+`openssl` CLI) that negotiates `h2` or `http/1.1` via ALPN and serves a
+gzip-compressed synthetic meet page for every path. Each response is held
+back `--latency` ms (upstream render time), and the first response on a new
+connection a further `--connect-delay` ms, standing in for the TCP + TLS
+handshake round trips to a remote host. A thread pool then fetches
+`--pages` pages through each transport, as the batch and combined-meet
+endpoints do.
+
+    python benchmarks/http_transport.py [--pages 60] [--threads 12] [--latency 50] [--connect-delay 100]
+
+Requires `h2` (installed with `httpx[http2]`).
+"""
+import argparse
+import asyncio
+import gzip
+import os
+import ssl
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import h2.config
+import h2.connection
+import h2.events
+
+from fixtures import build_meet_html
+from utils.common import build_http2_client, default_headers, response_markup
+
+BODY = gzip.compress(build_meet_html(events=40, rows=40).encode("utf-8"))
+RESPONSE_HEADERS = [
+    ("content-type", "text/html; charset=utf-8"),
+    ("content-encoding", "gzip"),
+    ("content-length", str(len(BODY))),
+]
+
+
+# ---------- Stub Server ---------- #
+
+class StubProtocol(asyncio.Protocol):
+    """One client connection; speaks whichever protocol ALPN selected."""
+
+    connections = 0
+
+    def __init__(self, latency, connect_delay):
+        self.latency = latency
+        self.connect_delay = connect_delay
+        self.h2 = None
+        self.buffer = b""
+        self.pending = {}  # stream id -> unsent body bytes (HTTP/2 flow control)
+
+    def connection_made(self, transport):
+        StubProtocol.connections += 1
+        self.transport = transport
+        self.loop = asyncio.get_running_loop()
+        self.ready_at = self.loop.time() + self.connect_delay
+        if transport.get_extra_info("ssl_object").selected_alpn_protocol() == "h2":
+            self.h2 = h2.connection.H2Connection(h2.config.H2Configuration(client_side=False))
+            self.h2.initiate_connection()
+            transport.write(self.h2.data_to_send())
+
+    def _respond_at(self):
+        return max(self.loop.time(), self.ready_at) + self.latency
+
+    def data_received(self, data):
+        if self.h2 is None:
+            self._http1_received(data)
+            return
+        for event in self.h2.receive_data(data):
+            if isinstance(event, h2.events.RequestReceived):
+                self.loop.call_at(self._respond_at(), self._h2_respond, event.stream_id)
+            elif isinstance(event, h2.events.WindowUpdated):
+                self._h2_flush()
+        self.transport.write(self.h2.data_to_send())
+
+    # HTTP/1.1: keep-alive, one request at a time
+    def _http1_received(self, data):
+        self.buffer += data
+        while b"\r\n\r\n" in self.buffer:
+            _, self.buffer = self.buffer.split(b"\r\n\r\n", 1)
+            self.loop.call_at(self._respond_at(), self._http1_respond)
+
+    def _http1_respond(self):
+        if self.transport.is_closing():
+            return
+        head = "HTTP/1.1 200 OK\r\n" + "".join(f"{k}: {v}\r\n" for k, v in RESPONSE_HEADERS) + "\r\n"
+        self.transport.write(head.encode("ascii") + BODY)
+
+    # HTTP/2: many streams per connection, bodies sent as the flow-control window allows
+    def _h2_respond(self, stream_id):
+        if self.transport.is_closing():
+            return
+        self.h2.send_headers(stream_id, [(":status", "200"), *RESPONSE_HEADERS])
+        self.pending[stream_id] = BODY
+        self._h2_flush()
+
+    def _h2_flush(self):
+        for stream_id, data in list(self.pending.items()):
+            while data:
+                window = min(self.h2.local_flow_control_window(stream_id), self.h2.max_outbound_frame_size)
+                if window <= 0:
+                    break
+                self.h2.send_data(stream_id, data[:window])
+                data = data[window:]
+            if data:
+                self.pending[stream_id] = data
+            else:
+                self.h2.end_stream(stream_id)
+                del self.pending[stream_id]
+        self.transport.write(self.h2.data_to_send())
+
+
+def make_certificate(directory):
+    cert, key = os.path.join(directory, "cert.pem"), os.path.join(directory, "key.pem")
+    subprocess.run(
+        ["openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes", "-days", "1",
+         "-subj", "/CN=localhost", "-addext", "subjectAltName=DNS:localhost", "-keyout", key, "-out", cert],
+        check=True, capture_output=True,
+    )
+    return cert, key
+
+
+def start_stub_server(cert, key, latency, connect_delay):
+    """Run the stub in a background event loop; returns its port."""
+    context = ssl.create_default_context(ssl.Purpose.CLIENT_AUTH)
+    context.load_cert_chain(cert, key)
+    context.set_alpn_protocols(["h2", "http/1.1"])
+
+    loop = asyncio.new_event_loop()
+    started = threading.Event()
+    port = []
+
+    async def serve():
+        server = await loop.create_server(
+            lambda: StubProtocol(latency, connect_delay), "127.0.0.1", 0, ssl=context
+        )
+        port.append(server.sockets[0].getsockname()[1])
+        started.set()
+        await server.serve_forever()
+
+    threading.Thread(target=loop.run_until_complete, args=(serve(),), daemon=True).start()
+    started.wait()
+    return port[0]
+
+
+# ---------- Clients ---------- #
+
+def run(fetch, urls, threads):
+    StubProtocol.connections = 0
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        sizes = list(pool.map(lambda url: len(response_markup(fetch(url))[0]), urls))
+    elapsed = time.perf_counter() - start
+    assert all(size == sizes[0] for size in sizes)
+    return elapsed, StubProtocol.connections
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, default=60)
+    parser.add_argument("--threads", type=int, default=12)
+    parser.add_argument("--latency", type=float, default=50, help="ms per response")
+    parser.add_argument("--connect-delay", type=float, default=100, help="extra ms for a connection's first response")
+    args = parser.parse_args()
+
+    import requests
+
+    with tempfile.TemporaryDirectory() as cert_dir:
+        cert, key = make_certificate(cert_dir)
+        port = start_stub_server(cert, key, args.latency / 1000, args.connect_delay / 1000)
+        urls = [f"https://localhost:{port}/results/{90000 + i}/m/" for i in range(args.pages)]
+        headers = default_headers()
+
+        # The self-signed certificate is trusted explicitly; both clients verify it
+        http2_client = build_http2_client(verify=ssl.create_default_context(cafile=cert))
+        transports = {
+            "requests.get per call": lambda url: requests.get(url, headers=headers, verify=cert),
+            "shared httpx client": lambda url: http2_client.get(url, headers=headers),
+        }
+
+        print(f"{args.pages} pages of {len(BODY) / 1000:.0f} kB, {args.threads} threads, "
+              f"{args.latency:.0f} ms latency, {args.connect_delay:.0f} ms connect delay")
+        for name, fetch in transports.items():
+            # Warm imports (and, for HTTP/2, the connection); requests responses carry no http_version
+            protocol = getattr(fetch(urls[0]), "http_version", "HTTP/1.1")
+            elapsed, connections = run(fetch, urls, args.threads)
+            print(f"  {name:<24} {protocol:<9} {elapsed:6.2f}s  {args.pages / elapsed:6.1f} pages/s  "
+                  f"{connections:3d} new connections")
+        http2_client.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+Cold-start benchmark for the API process.
+
+Imports `main` in fresh interpreters (each in an empty working directory) and
+reports the median import time, which heavy scraping dependencies were pulled
+in, and how many log files the import created as a side effect.
+
+    python benchmarks/import_time.py [--runs 15]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HEAVY_MODULES = ("bs4", "lxml", "brotli", "requests")
+
+CHILD = f"""
+import json, os, sys, time
+start = time.perf_counter()
+import main
+elapsed = time.perf_counter() - start
+log_files = sum(len(files) for _, _, files in os.walk("logs")) if os.path.isdir("logs") else 0
+print(json.dumps({{
+    "import_ms": elapsed * 1000,
+    "heavy": [m for m in {HEAVY_MODULES!r} if m in sys.modules],
+    "log_files": log_files,
+}}))
+"""
+
+
+def run_once():
+    with tempfile.TemporaryDirectory() as workdir:
+        env = {**os.environ, "PYTHONPATH": REPO_ROOT, "PYTHONDONTWRITEBYTECODE": "1"}
+        out = subprocess.run(
+            [sys.executable, "-c", CHILD], cwd=workdir, env=env, capture_output=True, text=True, check=True
+        ).stdout
+        return json.loads(out.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=15)
+    args = parser.parse_args()
+
+    run_once()  # warm the OS file cache and compile bytecode
+    samples = [run_once() for _ in range(args.runs)]
+    times = sorted(s["import_ms"] for s in samples)
+
+    print(f"import main: median {statistics.median(times):.1f} ms, "
+          f"min {times[0]:.1f} ms, max {times[-1]:.1f} ms ({args.runs} runs)")
+    print(f"heavy modules loaded at import: {', '.join(samples[-1]['heavy']) or 'none'}")
+    print(f"log files created at import: {samples[-1]['log_files']}")
+
+
+if __name__ == "__main__":
+    main()
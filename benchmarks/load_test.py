@@ -0,0 +1,254 @@
+"""
+Load test: the API under gunicorn against a local TFRRS stand-in.
+
+Starts `mock_tfrrs.py` (configurable latency and error injection) and the
+API (`gunicorn -c gunicorn.conf.py main:app`, `--workers` processes, SQLite
+cache in a temp dir, rate limit disabled) pointed at it via TFRRS_BASE_URL.
+Then drives a mixed search/athlete/meet/team workload with a closed loop
+of `c` concurrent clients for each concurrency level `c`, and reports
+throughput, latency percentiles, errors, and CPU and memory per worker
+(read from /proc, so Linux only).
+
+IDs are drawn from `--id-space` values per kind: a small space measures
+the cached path, a large one (or `--cache-ttl 0`) the scraping path.
+
+    python benchmarks/load_test.py [--workers 2] [--levels 1,4,16,64] [--duration 10]
+                                   [--latency 80] [--error-rate 0.01] [--mix athlete=35,meet=25,team=20,search=20]
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from fixtures import FIRST_NAMES, LAST_NAMES
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CLOCK_TICKS = os.sysconf("SC_CLK_TCK")
+PAGE_SIZE = os.sysconf("SC_PAGE_SIZE")
+
+
+# ---------- Processes ---------- #
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_mock(port, args):
+    proc = subprocess.Popen(
+        [sys.executable, os.path.join(REPO_ROOT, "benchmarks", "mock_tfrrs.py"), "--port", str(port),
+         "--latency", str(args.latency), "--jitter", str(args.jitter), "--error-rate", str(args.error_rate)],
+        stdout=subprocess.PIPE, text=True,
+    )
+    proc.stdout.readline()  # "listening" banner
+    return proc
+
+
+def start_api(port, mock_port, work_dir, args):
+    ttl = str(args.cache_ttl)
+    env = {
+        **os.environ,
+        "PORT": str(port),
+        "WEB_CONCURRENCY": str(args.workers),
+        "TFRRS_BASE_URL": f"http://127.0.0.1:{mock_port}",
+        "CACHE_BACKEND": "sqlite",
+        "CACHE_PATH": os.path.join(work_dir, "cache.db"),
+        "TFRRS_DB_PATH": os.path.join(work_dir, "tfrrs.db"),
+        "PAGE_ARCHIVE_DIR": os.path.join(work_dir, "archive"),
+        "LOG_FILE": os.path.join(work_dir, "tfrrs.log"),
+        "LOG_LEVEL": "WARNING",
+        "RATE_LIMIT_PER_SECOND": "1000000000",
+        "MEET_CACHE_TTL": ttl, "ATHLETE_CACHE_TTL": ttl, "TEAM_CACHE_TTL": ttl,
+        "HTTP_TRANSPORT": args.transport,
+    }
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py", "main:app"],
+        cwd=REPO_ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    deadline = time.time() + 60
+    while time.time() < deadline:
+        try:
+            if httpx.get(f"http://127.0.0.1:{port}/", timeout=1).status_code == 200 and len(worker_pids(proc.pid)) >= args.workers:
+                return proc
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    proc.terminate()
+    raise RuntimeError("API did not start within 60s")
+
+
+def worker_pids(master_pid) -> list:
+    """gunicorn worker processes: direct children of the master."""
+    pids = []
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as f:
+                fields = f.read().rsplit(")", 1)[1].split()
+        except OSError:
+            continue
+        if int(fields[1]) == master_pid:
+            pids.append(int(entry))
+    return sorted(pids)
+
+
+def cpu_seconds(pid) -> float:
+    with open(f"/proc/{pid}/stat") as f:
+        fields = f.read().rsplit(")", 1)[1].split()
+    return (int(fields[11]) + int(fields[12])) / CLOCK_TICKS  # utime + stime
+
+
+def rss_mb(pid) -> float:
+    with open(f"/proc/{pid}/statm") as f:
+        return int(f.read().split()[1]) * PAGE_SIZE / 1e6
+
+
+# ---------- Workload ---------- #
+
+def parse_mix(spec: str) -> dict:
+    mix = {}
+    for item in spec.split(","):
+        kind, _, weight = item.partition("=")
+        mix[kind.strip()] = float(weight)
+    return mix
+
+
+def make_request(rng, kind, id_space) -> str:
+    n = rng.randint(1, id_space)
+    if kind == "athlete":
+        return f"/athletes/{n}"
+    if kind == "meet":
+        if rng.random() < 0.1:
+            return f"/meets/{n}?sport=xc"
+        return f"/meets/{n}?sport=tf&gender={rng.choice(['m', 'f', 'both'])}"
+    if kind == "team":
+        return f"/teams/AZ_college_m_Team_{n}?sport=tf"
+    query = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+    return f"/search/?query_type={rng.choice(['athlete', 'team', 'meet'])}&query={query}"
+
+
+async def run_level(base_url, concurrency, duration, mix, id_space, seed):
+    kinds, weights = list(mix), list(mix.values())
+    results = []  # (kind, seconds, ok)
+    deadline = time.perf_counter() + duration
+
+    async def client(i, http):
+        rng = random.Random(seed * 1000 + i)
+        while time.perf_counter() < deadline:
+            kind = rng.choices(kinds, weights)[0]
+            start = time.perf_counter()
+            try:
+                r = await http.get(make_request(rng, kind, id_space))
+                ok = r.status_code < 500
+            except httpx.HTTPError:
+                ok = False
+            results.append((kind, time.perf_counter() - start, ok))
+
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, timeout=120, limits=limits,
+                                 headers={"Accept-Encoding": "gzip"}) as http:
+        await asyncio.gather(*(client(i, http) for i in range(concurrency)))
+    return results
+
+
+def percentile(sorted_values, q) -> float:
+    if not sorted_values:
+        return float("nan")
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * q))]
+
+
+def summarize(results, elapsed) -> dict:
+    latencies = sorted(seconds for _, seconds, _ in results)
+    by_kind = {}
+    for kind in sorted({kind for kind, _, _ in results}):
+        kind_latencies = sorted(seconds for k, seconds, _ in results if k == kind)
+        by_kind[kind] = {"count": len(kind_latencies), "p95_ms": percentile(kind_latencies, 0.95) * 1000}
+    return {
+        "requests": len(results),
+        "rps": len(results) / elapsed,
+        "p50_ms": percentile(latencies, 0.50) * 1000,
+        "p95_ms": percentile(latencies, 0.95) * 1000,
+        "p99_ms": percentile(latencies, 0.99) * 1000,
+        "error_rate": sum(not ok for _, _, ok in results) / max(len(results), 1),
+        "by_kind": by_kind,
+    }
+
+
+# ---------- Main ---------- #
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--levels", default="1,4,16,64", help="comma-separated client concurrency levels")
+    parser.add_argument("--duration", type=float, default=10, help="seconds per level")
+    parser.add_argument("--mix", default="athlete=35,meet=25,team=20,search=20")
+    parser.add_argument("--id-space", type=int, default=200, help="distinct IDs per kind")
+    parser.add_argument("--cache-ttl", type=float, default=300)
+    parser.add_argument("--latency", type=float, default=80, help="mock TFRRS latency (ms)")
+    parser.add_argument("--jitter", type=float, default=40, help="mock TFRRS jitter (ms)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="mock TFRRS 503 rate")
+    parser.add_argument("--transport", default="http1", choices=["http1", "http2"])
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", help="also write the full report to this file")
+    args = parser.parse_args()
+
+    mix = parse_mix(args.mix)
+    levels = [int(level) for level in args.levels.split(",")]
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        mock_port, api_port = free_port(), free_port()
+        mock = start_mock(mock_port, args)
+        api = None
+        try:
+            api = start_api(api_port, mock_port, work_dir, args)
+            pids = worker_pids(api.pid)
+            base_url = f"http://127.0.0.1:{api_port}"
+            print(f"{args.workers} workers (pids {pids}), mock latency {args.latency:.0f}±{args.jitter:.0f} ms, "
+                  f"error rate {args.error_rate:.1%}, id space {args.id_space}, mix {args.mix}")
+            print(f"{'clients':>7} {'rps':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'errors':>7}  "
+                  f"{'CPU % per worker':<22} RSS MB per worker")
+
+            report = []
+            for level in levels:
+                cpu_before = {pid: cpu_seconds(pid) for pid in pids}
+                start = time.perf_counter()
+                results = asyncio.run(run_level(base_url, level, args.duration, mix, args.id_space, args.seed + level))
+                elapsed = time.perf_counter() - start
+
+                row = summarize(results, elapsed)
+                row["clients"] = level
+                row["workers"] = [
+                    {"pid": pid, "cpu_pct": (cpu_seconds(pid) - cpu_before[pid]) / elapsed * 100, "rss_mb": rss_mb(pid)}
+                    for pid in pids
+                ]
+                report.append(row)
+
+                cpu = " ".join(f"{w['cpu_pct']:.0f}" for w in row["workers"])
+                rss = " ".join(f"{w['rss_mb']:.0f}" for w in row["workers"])
+                print(f"{level:>7} {row['rps']:>8.1f} {row['p50_ms']:>8.0f} {row['p95_ms']:>8.0f} "
+                      f"{row['p99_ms']:>8.0f} {row['error_rate']:>7.1%}  {cpu:<22} {rss}")
+
+            if args.json:
+                with open(args.json, "w") as f:
+                    json.dump({"args": vars(args), "levels": report}, f, indent=2)
+        finally:
+            if api:
+                api.terminate()
+                api.wait(timeout=30)
+            mock.terminate()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""
+Local stand-in for tfrrs.org, for load tests and offline development.
+
+Serves every page the scrapers fetch (homepage token, search POST, athlete,
+team, track/XC meet pages). Pages come from `--pages-dir` when a recorded
+file matches the request path (e.g. `athletes/7929458.html`,
+`results/92668/m.html`), otherwise from the synthetic builders in
+`fixtures.py`, seeded by the ID in the URL so the same URL always returns
+the same page. Every response is held back `--latency` ms (plus up to
+`--jitter` ms), and `--error-rate` of requests get a 503.
+
+    python benchmarks/mock_tfrrs.py [--port 8900] [--latency 80] [--jitter 40] [--error-rate 0.01]
+
+Then run the API with TFRRS_BASE_URL=http://127.0.0.1:8900.
+"""
+import argparse
+import gzip
+import os
+import random
+import re
+import sys
+import time
+from functools import lru_cache
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from fixtures import build_athlete_html, build_home_html, build_meet_html, build_search_html, build_team_html
+
+ROUTES = [
+    (re.compile(r"^/athletes/(\d+)"), lambda m: build_athlete_html(meets=40, seed=int(m.group(1)))),
+    (re.compile(r"^/teams/(?:tf|xc)/[^/]*?(\d*)\.html"), lambda m: build_team_html(seed=int(m.group(1) or 0))),
+    (re.compile(r"^/results/xc/(\d+)"), lambda m: build_meet_html(events=4, rows=150, seed=int(m.group(1)))),
+    (re.compile(r"^/results/(\d+)/[mf]"), lambda m: build_meet_html(events=30, rows=30, seed=int(m.group(1)))),
+    (re.compile(r"^/$"), lambda m: build_home_html()),
+]
+
+
+@lru_cache(maxsize=2048)
+def render(path: str) -> bytes | None:
+    """Gzip-compressed page for a request path, or None for a 404."""
+    if MockHandler.pages_dir:
+        recorded = os.path.join(MockHandler.pages_dir, path.strip("/").removesuffix(".html") + ".html")
+        if os.path.isfile(recorded):
+            with open(recorded, "rb") as f:
+                return gzip.compress(f.read())
+    for pattern, build in ROUTES:
+        match = pattern.search(path)
+        if match:
+            return gzip.compress(build(match).encode("utf-8"))
+    return None
+
+
+class MockHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+    latency = 0.0
+    jitter = 0.0
+    error_rate = 0.0
+    pages_dir = None
+
+    def _delay_or_fail(self) -> bool:
+        time.sleep(self.latency + random.uniform(0, self.jitter))
+        if random.random() < self.error_rate:
+            self._send(503, b"Service Unavailable", compressed=False)
+            return True
+        return False
+
+    def _send(self, status: int, body: bytes, compressed: bool = True):
+        self.send_response(status)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        if compressed:
+            self.send_header("Content-Encoding", "gzip")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self._delay_or_fail():
+            return
+        body = render(self.path.split("?", 1)[0])
+        if body is None:
+            self._send(404, b"Not Found", compressed=False)
+        else:
+            self._send(200, body)
+
+    def do_POST(self):
+        form = parse_qs(self.rfile.read(int(self.headers.get("Content-Length") or 0)).decode("utf-8"))
+        if self._delay_or_fail():
+            return
+        if not self.path.startswith("/search.html"):
+            self._send(404, b"Not Found", compressed=False)
+            return
+        # The search form fills exactly one of these fields
+        query_type = next((t for t in ("athlete", "team", "meet") if form.get(t, [""])[0]), "athlete")
+        seed = sum(map(ord, form.get(query_type, [""])[0]))
+        self._send(200, gzip.compress(build_search_html(query_type, seed=seed).encode("utf-8")))
+
+    def log_message(self, format, *args):
+        pass
+
+
+def serve(port: int, latency_ms: float, jitter_ms: float, error_rate: float, pages_dir: str | None = None):
+    MockHandler.latency = latency_ms / 1000
+    MockHandler.jitter = jitter_ms / 1000
+    MockHandler.error_rate = error_rate
+    MockHandler.pages_dir = pages_dir
+    server = ThreadingHTTPServer(("127.0.0.1", port), MockHandler)
+    server.daemon_threads = True
+    print(f"Mock TFRRS listening on http://127.0.0.1:{server.server_address[1]}", flush=True)
+    server.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=8900)
+    parser.add_argument("--latency", type=float, default=80, help="ms added to every response")
+    parser.add_argument("--jitter", type=float, default=40, help="up to this many extra ms, uniformly")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of requests answered with 503")
+    parser.add_argument("--pages-dir", help="directory of recorded pages, laid out like tfrrs.org paths")
+    args = parser.parse_args()
+    serve(args.port, args.latency, args.jitter, args.error_rate, args.pages_dir)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,20 @@
+# Gunicorn settings for the multi-worker deployment:
+#   gunicorn -c gunicorn.conf.py main:app
+#
+# Every worker shares scrape caches, rate-limit counters and search tokens
+# through the cache backend (CACHE_BACKEND=sqlite on one host, redis across hosts).
+import multiprocessing
+import os
+
+# Every worker rotates its own log file (see utils/logging_config.py); rotating
+# one shared file from several processes loses and clobbers files
+os.environ.setdefault("LOG_FILE_PER_PROCESS", "1")
+
+bind = f"0.0.0.0:{os.getenv('PORT', '8000')}"
+workers = int(os.getenv("WEB_CONCURRENCY", multiprocessing.cpu_count()))
+worker_class = "uvicorn.workers.UvicornWorker"
+
+# Scrapes of large meets can take a while; keep this above the upstream timeouts
+timeout = int(os.getenv("WORKER_TIMEOUT", "120"))
+graceful_timeout = 30
+keepalive = 5
@@ -1,9 +1,12 @@
+import os
+import time
 from fastapi import FastAPI, Request
-from slowapi import Limiter, _rate_limit_exceeded_handler
-from slowapi.errors import RateLimitExceeded
-from slowapi.util import get_remote_address
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse
 
-from api.routes import athletes, meets, teams, search
+from api.routes import athletes, meets, teams, search, upstream, jobs, leaderboards, export
+from utils.cache_backend import get_backend
+from utils.http_cache import conditional_response
 
 # -------------------------
 # Initialize FastAPI
@@ -17,18 +20,36 @@ app = FastAPI(
 # -------------------------
 # Global Rate Limiter Setup
 # -------------------------
-limiter = Limiter(key_func=get_remote_address)
-app.state.limiter = limiter
-app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
+# Fixed one-second windows counted in the shared cache backend, so the limit
+# holds across every worker process instead of being multiplied by N workers
+RATE_LIMIT_PER_SECOND = int(os.getenv("RATE_LIMIT_PER_SECOND", "5"))
 
-# Instead of calling a private method (_check_request_limit),
-# just decorate the entire app router using limiter.limit()
 @app.middleware("http")
-@limiter.limit("5/second")  # limit applied globally
 async def global_rate_limiter(request: Request, call_next):
+    client_ip = request.client.host if request.client else "127.0.0.1"
+    key = f"ratelimit:{client_ip}:{int(time.time())}"
+    try:
+        hits = await run_in_threadpool(get_backend().incr, key, 2)
+    except Exception:
+        hits = 0  # fail open: an unavailable backend must not take the API down
+    if hits > RATE_LIMIT_PER_SECOND:
+        return JSONResponse(
+            {"error": f"Rate limit exceeded: {RATE_LIMIT_PER_SECOND} per 1 second"}, status_code=429
+        )
     response = await call_next(request)
     return response
 
+# -------------------------
+# ETags + Compression
+# -------------------------
+# Registered after the rate limiter, so it wraps it: every buffered 200 gets a
+# content-hash ETag, If-None-Match is answered with 304, and large bodies are
+# brotli/gzip-compressed (SSE and NDJSON streams pass through untouched)
+@app.middleware("http")
+async def etag_and_compression(request: Request, call_next):
+    response = await call_next(request)
+    return await conditional_response(request, response)
+
 # -------------------------
 # Include Routers
 # -------------------------
@@ -36,6 +57,10 @@ app.include_router(athletes.router, prefix="/athletes", tags=["Athletes"])
 app.include_router(meets.router, prefix="/meets", tags=["Meets"])
 app.include_router(teams.router, prefix="/teams", tags=["Teams"])
 app.include_router(search.router, prefix="/search", tags=["Search"])
+app.include_router(upstream.router, prefix="/upstream", tags=["Upstream"])
+app.include_router(jobs.router, prefix="/jobs", tags=["Jobs"])
+app.include_router(leaderboards.router, prefix="/leaderboards", tags=["Leaderboards"])
+app.include_router(export.router, prefix="/export", tags=["Export"])
 
 # -------------------------
 # Root Endpoint
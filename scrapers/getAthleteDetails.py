@@ -1,11 +1,14 @@
-import requests
-from bs4 import BeautifulSoup
 import re
 import time
-from utils.common import safe_decode, extract_meet_id, extract_team_slug, default_headers, time_to_seconds
-from utils.logging_config import get_logger
+from utils.common import BASE_URL, response_markup, make_soup, extract_meet_id, extract_team_slug, default_headers, time_to_seconds
+from utils.logging_config import get_logger, get_sampled_logger
+from utils.ingest import ingest_athlete
+from utils.page_archive import archive_page
+from utils.progress import advance
+from utils.upstream import UpstreamError, UpstreamUnavailable, upstream_get
 
-logger = get_logger(__name__, "athlete_scrape.log")
+logger = get_logger(__name__)
+row_logger = get_sampled_logger(__name__)  # per-row and per-meet messages
 
 # ---------- Core Parsing Functions ---------- #
 
@@ -32,7 +35,7 @@ def extract_name_and_teams(soup):
     if not athlete_name:
         logger.warning("Athlete name not found on page.")
     else:
-        logger.debug(f"Parsed athlete: {athlete_name} ({class_year})")
+        logger.debug("Parsed athlete: %s (%s)", athlete_name, class_year)
 
     # --- Current Team (Name + Slug + Gender) ---
     current_team_slug = None
@@ -57,7 +60,7 @@ def extract_name_and_teams(soup):
                 gender = "Unknown"
 
             logger.debug(
-                f"Current team: {current_team_name} (slug={current_team_slug}, gender={gender})"
+                "Current team: %s (slug=%s, gender=%s)", current_team_name, current_team_slug, gender
             )
 
     # --- Previous Teams ---
@@ -69,7 +72,7 @@ def extract_name_and_teams(soup):
             if slug:
                 previous_team_slugs.append(slug)
         if previous_team_slugs:
-            logger.debug(f"Previous team slugs: {previous_team_slugs}")
+            logger.debug("Previous team slugs: %s", previous_team_slugs)
 
     return athlete_name, class_year, current_team_slug, current_team_name, gender, previous_team_slugs
 
@@ -120,7 +123,7 @@ def extract_athlete_results(soup):
             ]
             event_name = cols[0].get_text(strip=True)
             if event_name and any(k in event_name.lower() for k in exclude_keywords):
-                logger.debug(f"Skipping relay event: {event_name}")
+                row_logger.debug("Skipping relay event: %s", event_name)
                 continue
 
             mark = cols[1].get_text(strip=True)
@@ -147,63 +150,77 @@ def extract_athlete_results(soup):
                 "place": place,
                 "round": round_info,
             })
+            advance("results")
 
-        logger.debug(f"Parsed results for meet: {meet_name} ({meet_date})")
+        row_logger.debug("Parsed results for meet: %s (%s)", meet_name, meet_date)
 
-    logger.info(f"Total non-relay performances parsed: {len(results)}")
+    logger.info("Total non-relay performances parsed: %s", len(results))
     return results
 
 
 # ---------- Main Scraper ---------- #
 
+def parse_athlete_page(markup, charset=None):
+    """Parse downloaded athlete page markup. Pure function, safe to run in a worker process."""
+    soup = make_soup(markup, charset)
+    (
+        athlete_name,
+        class_year,
+        current_team_slug,
+        current_team_name,
+        gender,
+        previous_team_slugs,
+    ) = extract_name_and_teams(soup)
+
+    return {
+        "athlete_name": athlete_name,
+        "class_year": class_year,
+        "current_team_slug": current_team_slug,
+        "current_team_name": current_team_name,
+        "gender": gender,
+        "previous_team_slugs": previous_team_slugs,
+        "results": extract_athlete_results(soup),
+    }
+
+
 def get_athlete_details(athlete_url: str):
     """Scrape a TFRRS athlete page and return structured data."""
     if not athlete_url.startswith("http"):
-        athlete_url = f"https://www.tfrrs.org{athlete_url}"
+        athlete_url = f"{BASE_URL}{athlete_url}"
 
     start_time = time.time()
-    logger.info(f"Fetching athlete page: {athlete_url}")
+    logger.info("Fetching athlete page: %s", athlete_url)
 
     headers = default_headers()
 
     try:
-        r = requests.get(athlete_url, headers=headers, timeout=30)
-        html = safe_decode(r.content, r.headers.get("Content-Encoding"))
+        r = upstream_get("athlete", athlete_url, headers=headers)
+        markup, charset = response_markup(r)
+    except UpstreamError as e:
+        if e.status_code == 404:
+            return None
+        raise
+    except UpstreamUnavailable:
+        raise
     except Exception as e:
-        logger.error(f"Failed to fetch athlete page: {e}")
+        logger.error("Failed to fetch athlete page: %s", e)
         return None
 
+    archive_page("athlete", athlete_url, r, markup, charset)
     fetch_time = time.time() - start_time
-    soup = BeautifulSoup(html, "lxml")
 
     parse_start = time.time()
-    (
-        athlete_name,
-        class_year,
-        current_team_slug,
-        current_team_name,
-        gender,
-        previous_team_slugs,
-    ) = extract_name_and_teams(soup)
-
-    results = extract_athlete_results(soup)
+    data = parse_athlete_page(markup, charset)
     parse_time = time.time() - parse_start
 
     total_time = time.time() - start_time
     logger.info(
-        f"Scrape complete for {athlete_name} "
-        f"({len(results)} results, fetch: {fetch_time:.2f}s, parse: {parse_time:.2f}s, total: {total_time:.2f}s)"
+        "Scrape complete for %s (%s results, fetch: %.2fs, parse: %.2fs, total: %.2fs)",
+        data["athlete_name"], len(data["results"]), fetch_time, parse_time, total_time,
     )
 
-    return {
-        "athlete_name": athlete_name,
-        "class_year": class_year,
-        "current_team_slug": current_team_slug,
-        "current_team_name": current_team_name,
-        "gender": gender,
-        "previous_team_slugs": previous_team_slugs,
-        "results": results,
-    }
+    ingest_athlete(athlete_url, data)
+    return data
 
 
 # ---------- Manual Testing ---------- #
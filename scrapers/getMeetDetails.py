@@ -1,11 +1,16 @@
-import requests
-from bs4 import BeautifulSoup
 import re
 import time
-from utils.common import safe_decode, extract_athlete_id, extract_team_slug, default_headers, time_to_seconds
-from utils.logging_config import get_logger
-
-logger = get_logger(__name__, "meet_scrape.log")
+from concurrent.futures import ThreadPoolExecutor
+from utils.common import BASE_URL, response_markup, make_soup, extract_athlete_id, extract_team_slug, default_headers, time_to_seconds
+from utils.logging_config import get_logger, get_sampled_logger
+from utils.ingest import ingest_meet
+from utils.page_archive import archive_page
+from utils.parallel import get_parse_pool
+from utils.progress import advance, submit_in_context
+from utils.upstream import UpstreamError, UpstreamUnavailable, upstream_get
+
+logger = get_logger(__name__)
+event_logger = get_sampled_logger(__name__)  # per-event messages
 
 def parse_event_id(event_id_str: str):
     """Parse TFRRS event_id class strings like 'round_4_3200350_89' or 'heat_3_1_3200350_71'."""
@@ -41,7 +46,7 @@ def parse_tf_event_results(event_div, hidden_classes_set):
         "hammer", "javelin", "weight", "athlon"
     ]
     if event_name and any(k in event_name.lower() for k in exclude_keywords):
-        logger.debug(f"Skipping excluded event: {event_name}")
+        event_logger.debug("Skipping excluded event: %s", event_name)
         return None
 
     wind_elem = event_div.select_one(".custom-table-title .wind-text")
@@ -49,7 +54,7 @@ def parse_tf_event_results(event_div, hidden_classes_set):
 
     table = event_div.select_one("table.table-hover, table.table-striped")
     if not table:
-        logger.warning(f"No results table found for event: {event_name}")
+        event_logger.warning("No results table found for event: %s", event_name)
         return None
 
     results = []
@@ -85,7 +90,7 @@ def parse_tf_event_results(event_div, hidden_classes_set):
 
         round_num, round_label, heat_number, event_uid, valid_round = parse_event_id(event_id)
         if not valid_round:
-            logger.debug(f"Skipping combined heat round event: {event_name} ({event_id})")
+            event_logger.debug("Skipping combined heat round event: %s (%s)", event_name, event_id)
             return None
 
         results.append({
@@ -100,7 +105,7 @@ def parse_tf_event_results(event_div, hidden_classes_set):
             "event_id_str": event_id,
         })
 
-    logger.info(f"Parsed TF event: {event_name} ({len(results)} results)")
+    event_logger.info("Parsed TF event: %s (%s results)", event_name, len(results))
     return {
         "event_id": event_uid,
         "event_name": event_name,
@@ -129,8 +134,9 @@ def get_tf_results(soup, gender):
         if parsed:
             parsed["gender"] = gender
             events.append(parsed)
+            advance("events")
 
-    logger.info(f"Total TF events parsed: {len(events)}")
+    logger.info("Total TF events parsed: %s", len(events))
     return {
         "meet_type": "tf",
         "meet_name": meet_name,
@@ -160,12 +166,12 @@ def parse_xc_event(anchor):
     team_div = anchor.find_next("div", class_="row")
     indiv_div = team_div.find_next("div", class_="row") if team_div else None
     if not indiv_div:
-        logger.warning(f"No individual results div found for XC event {event_id}")
+        event_logger.warning("No individual results div found for XC event %s", event_id)
         return None
 
     table = indiv_div.select_one("table")
     if not table:
-        logger.warning(f"No results table found for XC event {event_id}")
+        event_logger.warning("No results table found for XC event %s", event_id)
         return None
 
     results = []
@@ -191,7 +197,7 @@ def parse_xc_event(anchor):
             "mark": cells[5].get_text(strip=True),
         })
 
-    logger.info(f"Parsed XC event: {event_name} ({len(results)} results)")
+    event_logger.info("Parsed XC event: %s (%s results)", event_name, len(results))
     return {"event_id": event_id, "event_name": event_name, "results": results}
 
 
@@ -210,8 +216,9 @@ def get_xc_results(soup):
         parsed = parse_xc_event(anchor)
         if parsed:
             events.append(parsed)
+            advance("events")
 
-    logger.info(f"Total XC events parsed: {len(events)}")
+    logger.info("Total XC events parsed: %s", len(events))
     return {
         "meet_type": "xc",
         "meet_name": meet_name,
@@ -223,17 +230,25 @@ def get_xc_results(soup):
 
 # ---------- Main entrypoint ---------- #
 
-def get_meet_results(meet_url: str):
-    """Scrape all event results from a TFRRS meet page."""
-    if not meet_url.startswith("http"):
-        meet_url = f"https://www.tfrrs.org{meet_url}"
-
+def fetch_meet_page(meet_url: str):
+    """Download a meet page; returns (markup bytes, charset), or (None, None) for a 404."""
     headers = default_headers()
 
-    logger.info(f"Fetching meet page: {meet_url}")
-    r = requests.get(meet_url, headers=headers, timeout=30)
-    html = safe_decode(r.content, r.headers.get("Content-Encoding"))
-    soup = BeautifulSoup(html, "lxml")
+    logger.info("Fetching meet page: %s", meet_url)
+    try:
+        r = upstream_get("meet", meet_url, headers=headers)
+    except UpstreamError as e:
+        if e.status_code == 404:
+            return None, None
+        raise
+    markup, charset = response_markup(r)
+    archive_page("meet", meet_url, r, markup, charset)
+    return markup, charset
+
+
+def parse_meet_page(meet_url: str, markup, charset=None):
+    """Parse downloaded meet page markup. Pure function, safe to run in a worker process."""
+    soup = make_soup(markup, charset)
 
     if "/xc/" in meet_url:
         logger.info("Detected XC meet page.")
@@ -248,6 +263,91 @@ def get_meet_results(meet_url: str):
         logger.error("Detected Invalid Meet URL.")
         return None
 
+
+def get_meet_results(meet_url: str):
+    """Scrape all event results from a TFRRS meet page."""
+    if not meet_url.startswith("http"):
+        meet_url = f"{BASE_URL}{meet_url}"
+
+    markup, charset = fetch_meet_page(meet_url)
+    if markup is None:
+        return None
+    data = parse_meet_page(meet_url, markup, charset)
+    if data is None:
+        return None
+
+    ingest_meet(meet_url, data)
+    return data
+
+
+def _scrape_gender(meet_url: str, parse_pool):
+    markup, charset = fetch_meet_page(meet_url)
+    if markup is None:
+        return None
+    if parse_pool is None:
+        data = parse_meet_page(meet_url, markup, charset)
+    else:
+        data = parse_pool.submit(parse_meet_page, meet_url, markup, charset).result()
+    if data is not None:
+        ingest_meet(meet_url, data)
+    return data
+
+
+def get_combined_tf_results(meet_id):
+    """
+    Scrape the men's and women's results of a track meet concurrently and
+    merge them into one document; every event keeps its `gender` tag.
+
+    Both pages are downloaded in parallel threads. Parsing runs in those
+    threads too, or in the shared process pool when PARSE_PROCESSES > 0
+    (BeautifulSoup parsing holds the GIL, so only processes parse truly in parallel).
+    If one gender fails the other is still returned, with the failure under `errors`.
+    """
+    start = time.time()
+    urls = {gender: f"{BASE_URL}/results/{meet_id}/{gender}/" for gender in ("m", "f")}
+    parse_pool = get_parse_pool()
+
+    with ThreadPoolExecutor(max_workers=len(urls)) as pool:
+        futures = {gender: submit_in_context(pool, _scrape_gender, url, parse_pool) for gender, url in urls.items()}
+
+    parts, errors, unavailable = {}, {}, None
+    for gender, future in futures.items():
+        try:
+            data = future.result()
+        except Exception as e:
+            logger.error("Failed to scrape %s results for meet %s: %s", gender, meet_id, e)
+            errors[gender] = str(e)
+            if isinstance(e, UpstreamUnavailable):
+                unavailable = e
+            continue
+        if data:
+            parts[gender] = data
+
+    if not parts:
+        if unavailable:
+            raise unavailable
+        if errors:
+            raise RuntimeError(f"Both genders failed for meet {meet_id}: {errors}")
+        return None
+
+    first = next(iter(parts.values()))
+    combined = {
+        "meet_type": "tf",
+        "meet_name": first.get("meet_name"),
+        "meet_date": first.get("meet_date"),
+        "meet_location": first.get("meet_location"),
+        "genders": list(parts),
+        "events": [event for data in parts.values() for event in data["events"]],
+    }
+    if errors:
+        combined["errors"] = errors
+
+    logger.info(
+        "Combined meet %s: %s events (%s) in %.2fs",
+        meet_id, len(combined["events"]), "+".join(parts), time.time() - start,
+    )
+    return combined
+
 # ---------- Manual Testing ---------- #
 
 #if __name__ == "__main__":
@@ -1,13 +1,16 @@
-import requests
-from bs4 import BeautifulSoup
+import os
 import re
 import time
-from utils.common import safe_decode, default_headers
+from utils.cache_backend import get_backend
+from utils.common import response_markup, make_soup, http_session, default_headers, BASE_URL, HTTP_CONNECT_TIMEOUT, HTTP_TIMEOUT
 from utils.logging_config import get_logger
+from utils.ingest import ingest_search
 
-logger = get_logger(__name__, "search_scrape.log")
+logger = get_logger(__name__)
 
-BASE_URL = "https://www.tfrrs.org"
+# Seconds a CSRF token (and the session cookies it is bound to) is reused across workers
+SEARCH_TOKEN_TTL = float(os.getenv("SEARCH_TOKEN_TTL", "1800"))
+TOKEN_CACHE_KEY = "search:token"
 
 # ---------- Core Logic ---------- #
 
@@ -19,23 +22,50 @@ def get_authenticity_token(session):
     headers = default_headers()
 
     try:
-        r = session.get(BASE_URL + "/", headers=headers, timeout=20)
-        html = safe_decode(r.content, r.headers.get("Content-Encoding"))
-        soup = BeautifulSoup(html, "lxml")
+        r = session.get(BASE_URL + "/", headers=headers, timeout=(HTTP_CONNECT_TIMEOUT, HTTP_TIMEOUT))
+        markup, charset = response_markup(r)
+        soup = make_soup(markup, charset)
 
         token_input = soup.find("input", {"name": "authenticity_token"})
         if not token_input or not token_input.get("value"):
             raise ValueError("Could not find authenticity_token on homepage.")
 
         token = token_input["value"]
-        logger.debug(f"Token fetched in {time.time() - start:.2f}s")
+        logger.debug("Token fetched in %.2fs", time.time() - start)
         return token
 
     except Exception as e:
-        logger.error(f"Failed to fetch authenticity token: {e}")
+        logger.error("Failed to fetch authenticity token: %s", e)
         raise
 
 
+def get_search_session(refresh=False):
+    """
+    Return (session, token) ready for a search POST.
+    The token and its cookies are shared through the cache backend, so
+    searches skip the homepage round trip while a token is fresh.
+    """
+    session = http_session()
+    backend = get_backend()
+
+    if not refresh:
+        try:
+            cached = backend.get(TOKEN_CACHE_KEY)
+        except Exception as e:
+            logger.warning("Token cache read failed: %s", e)
+            cached = None
+        if cached:
+            session.cookies.update(cached["cookies"])
+            return session, cached["token"]
+
+    token = get_authenticity_token(session)
+    try:
+        backend.set(TOKEN_CACHE_KEY, {"token": token, "cookies": session.cookies.get_dict()}, SEARCH_TOKEN_TTL)
+    except Exception as e:
+        logger.warning("Token cache write failed: %s", e)
+    return session, token
+
+
 def search_tfrrs(query_type, query_value):
     """
     Perform a TFRRS search for athletes, teams, or meets.
@@ -44,21 +74,7 @@ def search_tfrrs(query_type, query_value):
     if query_type not in {"athlete", "team", "meet"}:
         raise ValueError("Invalid query_type. Must be 'athlete', 'team', or 'meet'.")
 
-    logger.info(f"Searching TFRRS for {query_type}: '{query_value}'")
-    session = requests.Session()
-
-    try:
-        token = get_authenticity_token(session)
-    except Exception as e:
-        logger.error(f"Aborting search: unable to fetch token ({e})")
-        return []
-
-    payload = {
-        "authenticity_token": token,
-        "athlete": query_value if query_type == "athlete" else "",
-        "team": query_value if query_type == "team" else "",
-        "meet": query_value if query_type == "meet" else "",
-    }
+    logger.info("Searching TFRRS for %s: '%s'", query_type, query_value)
 
     headers = {
         "User-Agent": (
@@ -70,15 +86,36 @@ def search_tfrrs(query_type, query_value):
         "Accept-Encoding": "gzip, deflate, br",
     }
 
-    try:
-        start = time.time()
-        r = session.post(BASE_URL + "/search.html", data=payload, headers=headers, timeout=30)
-        html = safe_decode(r.content, r.headers.get("Content-Encoding"))
-        soup = BeautifulSoup(html, "lxml")
-        logger.info(f"Search request completed in {time.time() - start:.2f}s")
-    except Exception as e:
-        logger.error(f"Search request failed: {e}")
-        return []
+    # A shared token may have expired upstream; retry once with a fresh one
+    for attempt in range(2):
+        try:
+            session, token = get_search_session(refresh=attempt > 0)
+        except Exception as e:
+            logger.error("Aborting search: unable to fetch token (%s)", e)
+            return []
+
+        payload = {
+            "authenticity_token": token,
+            "athlete": query_value if query_type == "athlete" else "",
+            "team": query_value if query_type == "team" else "",
+            "meet": query_value if query_type == "meet" else "",
+        }
+
+        try:
+            start = time.time()
+            r = session.post(BASE_URL + "/search.html", data=payload, headers=headers, timeout=(HTTP_CONNECT_TIMEOUT, HTTP_TIMEOUT))
+        except Exception as e:
+            logger.error("Search request failed: %s", e)
+            return []
+
+        if r.status_code in (403, 422) and attempt == 0:
+            logger.info("Search token rejected (%s); refreshing", r.status_code)
+            continue
+
+        markup, charset = response_markup(r)
+        soup = make_soup(markup, charset)
+        logger.info("Search request completed in %.2fs", time.time() - start)
+        break
 
     # Route to correct parser
     if query_type == "athlete":
@@ -88,7 +125,8 @@ def search_tfrrs(query_type, query_value):
     else:
         results = parse_meet_results(soup)
 
-    logger.info(f"Found {len(results)} {query_type} results for '{query_value}'")
+    logger.info("Found %s %s results for '%s'", len(results), query_type, query_value)
+    ingest_search(query_type, results)
     return results
 
 
@@ -120,7 +158,7 @@ def parse_athlete_results(soup):
             "team_slug": team_slug,
         })
 
-    logger.debug(f"Parsed {len(results)} athlete results")
+    logger.debug("Parsed %s athlete results", len(results))
     return results
 
 
@@ -145,7 +183,7 @@ def parse_team_results(soup):
             "gender": gender_cell.text.strip() if gender_cell else None,
         })
 
-    logger.debug(f"Parsed {len(results)} team results")
+    logger.debug("Parsed %s team results", len(results))
     return results
 
 
@@ -170,7 +208,7 @@ def parse_meet_results(soup):
             "sport": sport_cell.text.strip() if sport_cell else None,
         })
 
-    logger.debug(f"Parsed {len(results)} meet results")
+    logger.debug("Parsed %s meet results", len(results))
     return results
 
 
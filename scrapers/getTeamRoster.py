@@ -1,11 +1,12 @@
-import requests
-from bs4 import BeautifulSoup
 import re
 import time
-from utils.common import safe_decode, default_headers
+from utils.common import response_markup, make_soup, default_headers, BASE_URL
 from utils.logging_config import get_logger
+from utils.ingest import ingest_roster
+from utils.page_archive import archive_page
+from utils.upstream import UpstreamError, UpstreamUnavailable, upstream_get
 
-logger = get_logger(__name__, "team_scrape.log")
+logger = get_logger(__name__)
 
 # ---------- Core Logic ---------- #
 
@@ -20,26 +21,40 @@ def get_team_roster(team_url: str):
         - roster: list of athletes (athlete_id, name, year)
     """
     if not team_url.startswith("http"):
-        team_url = "https://www.tfrrs.org" + team_url
+        team_url = BASE_URL + team_url
 
-    logger.info(f"Fetching team roster: {team_url}")
+    logger.info("Fetching team roster: %s", team_url)
 
-    # Derive sport type from URL (e.g., /teams/tf/... or /teams/xc/...)
-    sport_match = re.search(r"/teams/(tf|xc)/", team_url)
-    sport_type = sport_match.group(1) if sport_match else None
-
-    session = requests.Session()
     headers = default_headers()
 
-    start = time.time()
     try:
-        r = session.get(team_url, headers=headers, timeout=30)
-        html = safe_decode(r.content, r.headers.get("Content-Encoding"))
+        r = upstream_get("team", team_url, headers=headers)
+        markup, charset = response_markup(r)
+    except UpstreamError as e:
+        if e.status_code == 404:
+            return None
+        raise
+    except UpstreamUnavailable:
+        raise
     except Exception as e:
-        logger.error(f"Failed to fetch team page: {e}")
+        logger.error("Failed to fetch team page: %s", e)
         return None
 
-    soup = BeautifulSoup(html, "lxml")
+    archive_page("team", team_url, r, markup, charset)
+    data = parse_team_page(team_url, markup, charset)
+    ingest_roster(team_url, data)
+    return data
+
+
+def parse_team_page(team_url: str, markup, charset=None):
+    """Parse downloaded team page markup. Pure function, safe to run in a worker process."""
+    start = time.time()
+
+    # Derive sport type from URL (e.g., /teams/tf/... or /teams/xc/...)
+    sport_match = re.search(r"/teams/(tf|xc)/", team_url)
+    sport_type = sport_match.group(1) if sport_match else None
+
+    soup = make_soup(markup, charset)
 
     # ---------- Team name ----------
     team_name_el = soup.select_one("h3.panel-title.large-title, h3.panel-title")
@@ -60,7 +75,7 @@ def get_team_roster(team_url: str):
     # ---------- Roster Table ----------
     roster_table = soup.select_one("table.tablesaw")
     if not roster_table:
-        logger.warning(f"No roster table found for {team_url}")
+        logger.warning("No roster table found for %s", team_url)
         return {
             "team_name": team_name,
             "sport_type": sport_type,
@@ -96,15 +111,16 @@ def get_team_roster(team_url: str):
             "year": year
         })
 
-    logger.info(f"Parsed roster for {team_name} ({len(roster)} athletes, {sport_type.upper()}) in {time.time() - start:.2f}s")
+    logger.info("Parsed roster for %s (%s athletes, %s) in %.2fs", team_name, len(roster), sport_type.upper(), time.time() - start)
 
-    return {
+    data = {
         "team_name": team_name,
         "sport_type": sport_type,
         "conference": conference,
         "region": region,
         "roster": roster
     }
+    return data
 
 
 # ---------- Manual Testing ---------- #
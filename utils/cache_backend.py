@@ -0,0 +1,255 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from utils.db import connect
+from utils.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# Backend selection: "sqlite" (default, shared by every worker on one host),
+# "redis" (shared across hosts) or "memory" (per-process, for local dev/tests)
+CACHE_BACKEND = os.getenv("CACHE_BACKEND", "sqlite")
+CACHE_PATH = os.getenv("CACHE_PATH", os.path.join("data", "cache.db"))
+REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+
+# Purge expired SQLite rows once every N writes
+PURGE_EVERY = 500
+
+# Scrape results are kept this many seconds past their TTL and served when a
+# fresh scrape fails (e.g. while the upstream circuit breaker is open)
+CACHE_STALE_TTL = float(os.getenv("CACHE_STALE_TTL", "86400"))
+
+
+class CacheBackend:
+    """
+    Minimal shared key/value store used for scrape caches, rate-limit
+    counters and search tokens. Values must be JSON-serializable.
+    """
+
+    def get(self, key: str):
+        raise NotImplementedError
+
+    def set(self, key: str, value, ttl: float):
+        raise NotImplementedError
+
+    def delete(self, key: str):
+        raise NotImplementedError
+
+    def incr(self, key: str, ttl: float) -> int:
+        """Atomically increment a counter; a new counter expires after `ttl` seconds."""
+        raise NotImplementedError
+
+
+class MemoryBackend(CacheBackend):
+    """Per-process backend; also a drop-in stand-in for Redis in tests."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._data = {}
+
+    def get(self, key):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at < time.time():
+                del self._data[key]
+                return None
+            return json.loads(value)
+
+    def set(self, key, value, ttl):
+        with self._lock:
+            self._data[key] = (json.dumps(value), time.time() + ttl)
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def incr(self, key, ttl):
+        with self._lock:
+            now = time.time()
+            value, expires_at = self._data.get(key, ("0", 0))
+            if expires_at < now:
+                value, expires_at = "0", now + ttl
+            value = str(int(value) + 1)
+            self._data[key] = (value, expires_at)
+            return int(value)
+
+
+class SQLiteBackend(CacheBackend):
+    """File-backed backend shared by every worker process on the same host."""
+
+    def __init__(self, path: str = CACHE_PATH):
+        self._lock = threading.Lock()
+        self._conn = connect(path)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)"
+        )
+        self._conn.commit()
+        self._writes = 0
+
+    def get(self, key):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value FROM cache WHERE key = ? AND expires_at >= ?", (key, time.time())
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def set(self, key, value, ttl):
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, json.dumps(value), time.time() + ttl),
+            )
+            self._conn.commit()
+            self._maybe_purge()
+
+    def delete(self, key):
+        with self._lock:
+            self._conn.execute("DELETE FROM cache WHERE key = ?", (key,))
+            self._conn.commit()
+
+    def incr(self, key, ttl):
+        now = time.time()
+        with self._lock:
+            # RETURNING makes the read-modify-write a single atomic statement across processes
+            (value,) = self._conn.execute(
+                "INSERT INTO cache (key, value, expires_at) VALUES (?, '1', ?) "
+                "ON CONFLICT(key) DO UPDATE SET "
+                "value = CASE WHEN expires_at < ? THEN '1' ELSE CAST(CAST(value AS INTEGER) + 1 AS TEXT) END, "
+                "expires_at = CASE WHEN expires_at < ? THEN excluded.expires_at ELSE expires_at END "
+                "RETURNING value",
+                (key, now + ttl, now, now),
+            ).fetchone()
+            self._conn.commit()
+            self._maybe_purge()
+        return int(value)
+
+    def _maybe_purge(self):
+        self._writes += 1
+        if self._writes % PURGE_EVERY == 0:
+            self._conn.execute("DELETE FROM cache WHERE expires_at < ?", (time.time(),))
+            self._conn.commit()
+
+
+class RedisBackend(CacheBackend):
+    """
+    Redis-backed backend shared across hosts. Pass `client` to use any
+    redis-py compatible client (e.g. fakeredis in tests).
+    """
+
+    def __init__(self, url: str = REDIS_URL, client=None):
+        if client is None:
+            try:
+                import redis
+            except ImportError as e:
+                raise RuntimeError("CACHE_BACKEND=redis requires the 'redis' package") from e
+            client = redis.Redis.from_url(url)
+        self._client = client
+
+    def get(self, key):
+        value = self._client.get(key)
+        return json.loads(value) if value is not None else None
+
+    def set(self, key, value, ttl):
+        self._client.set(key, json.dumps(value), px=max(1, int(ttl * 1000)))
+
+    def delete(self, key):
+        self._client.delete(key)
+
+    def incr(self, key, ttl):
+        pipe = self._client.pipeline()
+        pipe.incr(key)
+        pipe.pexpire(key, max(1, int(ttl * 1000)), nx=True)
+        value, _ = pipe.execute()
+        return int(value)
+
+
+_backend = None
+_backend_lock = threading.Lock()
+
+def get_backend() -> CacheBackend:
+    """Return the process-wide backend selected by CACHE_BACKEND (created on first use)."""
+    global _backend
+    with _backend_lock:
+        if _backend is None:
+            if CACHE_BACKEND == "redis":
+                _backend = RedisBackend()
+            elif CACHE_BACKEND == "memory":
+                _backend = MemoryBackend()
+            elif CACHE_BACKEND == "sqlite":
+                _backend = SQLiteBackend()
+            else:
+                raise ValueError(f"Unknown CACHE_BACKEND '{CACHE_BACKEND}' (expected sqlite, redis or memory)")
+            logger.info(f"Using {CACHE_BACKEND} cache backend")
+        return _backend
+
+
+# ---------- ETags ---------- #
+
+def render_json(data) -> bytes:
+    """Serialize a payload exactly as FastAPI's JSONResponse does."""
+    return json.dumps(data, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")).encode("utf-8")
+
+
+def content_etag(body: bytes) -> str:
+    """Weak content-hash ETag (weak, so gzip/brotli variants of the same body share it)."""
+    return f'W/"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+
+
+def cached_etag(key: str) -> str | None:
+    """ETag of the payload currently cached under `key`, without loading the payload."""
+    try:
+        return get_backend().get(f"etag:{key}")
+    except Exception as e:
+        logger.warning(f"ETag read failed for {key}: {e}")
+        return None
+
+
+# ---------- Scrape Result Cache ---------- #
+
+def cached_scrape(key: str, ttl: float, scrape, *args):
+    """
+    Return a cached scrape result shared by every worker, or run `scrape(*args)`
+    and cache it together with its ETag. Empty results (failed scrapes) are
+    never cached, and a broken backend degrades to scraping directly.
+
+    Expired results stay stored for CACHE_STALE_TTL more seconds; when the
+    fresh scrape raises or comes back empty, the stale copy is served instead.
+    """
+    backend = get_backend()
+    stale = None
+    try:
+        entry = backend.get(key)
+        if isinstance(entry, dict) and "fresh_until" in entry:
+            if entry["fresh_until"] >= time.time():
+                logger.debug(f"Cache hit: {key}")
+                return entry["data"]
+            stale = entry["data"]
+    except Exception as e:
+        logger.warning(f"Cache read failed for {key}: {e}")
+
+    try:
+        data = scrape(*args)
+    except Exception as e:
+        if stale is None:
+            raise
+        logger.warning(f"Serving stale {key} after scrape failure: {e}")
+        return stale
+
+    if not data:
+        if stale is not None:
+            logger.warning(f"Serving stale {key} after empty scrape")
+            return stale
+        return data
+
+    try:
+        backend.set(key, {"fresh_until": time.time() + ttl, "data": data}, ttl + CACHE_STALE_TTL)
+        backend.set(f"etag:{key}", content_etag(render_json(data)), ttl)
+    except Exception as e:
+        logger.warning(f"Cache write failed for {key}: {e}")
+    return data
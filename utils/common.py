@@ -1,18 +1,120 @@
-import re
-import brotli
+import codecs
 import gzip
+import os
+import re
+import threading
+
+# bs4/lxml, requests, httpx and brotli are imported on first use rather than at
+# module import, so the API process starts without loading the scraping stack.
+
+# Upstream site; point at a local stand-in (benchmarks/mock_tfrrs.py) for load tests
+BASE_URL = os.getenv("TFRRS_BASE_URL", "https://www.tfrrs.org").rstrip("/")
+
+# Transport for page fetches: "http1" (a fresh `requests` call per page) or
+# "http2" (one shared httpx client multiplexing every fetch over a few connections)
+HTTP_TRANSPORT = os.getenv("HTTP_TRANSPORT", "http1").lower()
+
+# Seconds to wait on TFRRS: connecting, and overall per read
+HTTP_CONNECT_TIMEOUT = float(os.getenv("HTTP_CONNECT_TIMEOUT", "10"))
+HTTP_TIMEOUT = float(os.getenv("HTTP_TIMEOUT", "30"))
+
+# Idle connections the HTTP/2 client keeps alive per process (each carries ~100
+# concurrent streams). This is not a cap on open connections: before ALPN settles,
+# or when the server falls back to HTTP/1.1, concurrent fetches may each open one,
+# up to 100x this number, and the extras are closed once idle
+HTTP2_MAX_CONNECTIONS = int(os.getenv("HTTP2_MAX_CONNECTIONS", "2"))
+
+_http2_client = None
+_http2_client_lock = threading.Lock()
+
+def make_soup(markup, encoding=None):
+    """
+    Parse an HTML document with BeautifulSoup + lxml.
+    Raw bytes are handed to lxml as-is, decoded with `encoding` when known.
+    """
+    from bs4 import BeautifulSoup
+    if isinstance(markup, bytes):
+        return BeautifulSoup(markup, "lxml", from_encoding=encoding)
+    return BeautifulSoup(markup, "lxml")
+
+
+def http_session():
+    """Return a new `requests.Session` (for flows that need cookies)."""
+    import requests
+    return requests.Session()
+
+
+def build_http2_client(**overrides):
+    """Build an httpx client speaking HTTP/2 (negotiated via ALPN, HTTP/1.1 fallback)."""
+    import httpx
+    options = {
+        "http2": True,
+        "follow_redirects": True,
+        "timeout": httpx.Timeout(HTTP_TIMEOUT, connect=HTTP_CONNECT_TIMEOUT),
+        "limits": httpx.Limits(max_connections=HTTP2_MAX_CONNECTIONS * 100, max_keepalive_connections=HTTP2_MAX_CONNECTIONS),
+        **overrides,
+    }
+    return httpx.Client(**options)
 
-def safe_decode(content, encoding):
-    """Decode HTTP response content based on encoding."""
+
+def get_http2_client():
+    """The process-wide HTTP/2 client (created on first use, so each forked worker gets its own)."""
+    global _http2_client
+    with _http2_client_lock:
+        if _http2_client is None:
+            _http2_client = build_http2_client()
+        return _http2_client
+
+
+def http_get(url: str, **kwargs):
+    """
+    Fetch one page over the configured transport. Both return a response
+    with `.content`, `.headers` and `.status_code`, so callers need not care.
+    """
+    if HTTP_TRANSPORT == "http2":
+        return get_http2_client().get(url, **kwargs)
+    import requests
+    kwargs.setdefault("timeout", (HTTP_CONNECT_TIMEOUT, HTTP_TIMEOUT))
+    return requests.get(url, **kwargs)
+
+
+_HEADER_CHARSET = re.compile(r"charset=[\"']?([\w.:-]+)", re.I)
+_META_CHARSET = re.compile(rb"<meta[^>]+charset=[\"']?([\w.:-]+)", re.I)
+
+def detect_charset(content: bytes, content_type: str | None = None) -> str:
+    """Charset from the Content-Type header, else a <meta> tag near the top of the page, else UTF-8."""
+    match = _HEADER_CHARSET.search(content_type or "")
+    charset = match.group(1) if match else None
+    if not charset:
+        meta = _META_CHARSET.search(content[:4096])
+        charset = meta.group(1).decode("ascii") if meta else "utf-8"
     try:
-        if encoding == "br":
-            return brotli.decompress(content).decode("utf-8", errors="replace")
-        elif encoding == "gzip":
-            return gzip.decompress(content).decode("utf-8", errors="replace")
-        else:
-            return content.decode("utf-8", errors="replace")
-    except Exception:
-        return content.decode("utf-8", errors="replace")
+        return codecs.lookup(charset).name
+    except LookupError:
+        return "utf-8"
+
+
+def response_markup(r):
+    """
+    Return (body bytes, charset) for a fetched page, ready for `make_soup`.
+
+    The HTTP client has already undone Content-Encoding, so the body is used
+    as-is; it is only decompressed here when it still carries a gzip magic
+    number or, for brotli, does not look like markup. Nothing is decoded to str.
+    """
+    content = r.content
+    content_encoding = (r.headers.get("Content-Encoding") or "").lower()
+
+    if content[:2] == b"\x1f\x8b":
+        content = gzip.decompress(content)
+    elif content_encoding == "br" and b"<" not in content[:256]:
+        try:
+            import brotli
+            content = brotli.decompress(content)
+        except Exception:
+            pass
+
+    return content, detect_charset(content, r.headers.get("Content-Type"))
 
 
 def extract_athlete_id(url: str) -> str | None:
@@ -0,0 +1,22 @@
+import os
+import sqlite3
+
+# Local SQLite database shared by the persistent indexes
+DB_PATH = os.getenv("TFRRS_DB_PATH", os.path.join("data", "tfrrs.db"))
+
+# Each worker process keeps the indexes in memory. The first lookup this many
+# seconds after its last check reads the rows other workers added since, so a
+# scrape served by one worker is visible on every worker within this bound
+INDEX_REFRESH_INTERVAL = float(os.getenv("INDEX_REFRESH_INTERVAL", "2"))
+
+
+def connect(path: str = DB_PATH) -> sqlite3.Connection:
+    """Open the local database (WAL mode so several processes can share it)."""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    return conn
@@ -0,0 +1,332 @@
+"""
+Columnar bulk export of meet and athlete results (Arrow IPC stream, Parquet or CSV).
+
+Scraped documents are flattened into one typed row per result and written in
+record batches of EXPORT_BATCH_ROWS rows, each handed to the caller as soon
+as it is encoded, so an export of any size holds at most a few meets (or
+athletes) and one batch in memory. Used by the /export routes and from the
+command line:
+
+    python -m utils.export meets 92668 92669 [--sport tf] [--gender both] --output meets.parquet
+    python -m utils.export meets --start-date 2025-03-01 --end-date 2025-05-31 --sport tf --output season.arrow
+    python -m utils.export athletes 7929458 8012345 --output athletes.csv
+
+Requires `pyarrow` (see requirments.txt).
+"""
+import argparse
+import io
+import os
+import re
+import sys
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from utils.common import time_to_seconds
+from utils.logging_config import get_logger
+from utils.meet_batch import BATCH_CONCURRENCY, parse_meet_date
+
+logger = get_logger(__name__)
+
+# Rows per record batch (and Parquet row group); bounds export memory
+EXPORT_BATCH_ROWS = int(os.getenv("EXPORT_BATCH_ROWS", "10000"))
+
+EXPORT_FORMATS = {
+    "arrow": ("application/vnd.apache.arrow.stream", "arrow"),
+    "parquet": ("application/vnd.apache.parquet", "parquet"),
+    "csv": ("text/csv", "csv"),
+}
+
+
+def _pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.csv
+        import pyarrow.ipc
+        import pyarrow.parquet
+    except ImportError as e:
+        raise RuntimeError("Columnar export requires the 'pyarrow' package") from e
+    return pyarrow
+
+
+def meet_schema():
+    pa = _pyarrow()
+    return pa.schema([
+        ("meet_id", pa.string()),
+        ("meet_name", pa.string()),
+        ("meet_date", pa.date32()),
+        ("meet_location", pa.string()),
+        ("meet_type", pa.string()),
+        ("gender", pa.string()),
+        ("event_id", pa.string()),
+        ("event_name", pa.string()),
+        ("round", pa.string()),
+        ("round_num", pa.int8()),
+        ("heat", pa.int16()),
+        ("wind", pa.float64()),
+        ("place", pa.int32()),
+        ("athlete_id", pa.string()),
+        ("athlete_name", pa.string()),
+        ("year", pa.string()),
+        ("team_slug", pa.string()),
+        ("team_name", pa.string()),
+        ("mark", pa.string()),
+        ("mark_seconds", pa.float64()),
+    ])
+
+
+def athlete_schema():
+    pa = _pyarrow()
+    return pa.schema([
+        ("athlete_id", pa.string()),
+        ("athlete_name", pa.string()),
+        ("gender", pa.string()),
+        ("team_slug", pa.string()),
+        ("team_name", pa.string()),
+        ("meet_id", pa.string()),
+        ("meet_name", pa.string()),
+        ("meet_date", pa.date32()),
+        ("meet_type", pa.string()),
+        ("event_id", pa.string()),
+        ("event_name", pa.string()),
+        ("round", pa.string()),
+        ("place", pa.int32()),
+        ("mark", pa.string()),
+        ("mark_seconds", pa.float64()),
+    ])
+
+
+# ---------- Flattening ---------- #
+
+def _place(value) -> int | None:
+    match = re.match(r"\s*(\d+)", str(value or ""))
+    return int(match.group(1)) if match else None
+
+
+def _seconds(value, mark) -> float | None:
+    if not isinstance(value, (int, float)):
+        value = time_to_seconds(mark)
+    return float(value) if isinstance(value, (int, float)) else None
+
+
+def meet_rows(meet_id, data):
+    """One row per result of a `get_meet_results` / `get_combined_tf_results` document."""
+    meet = {
+        "meet_id": str(meet_id),
+        "meet_name": data.get("meet_name"),
+        "meet_date": parse_meet_date(data.get("meet_date")),
+        "meet_location": data.get("meet_location"),
+        "meet_type": data.get("meet_type"),
+    }
+    for event in data.get("events", []):
+        for row in event.get("results", []):
+            yield {
+                **meet,
+                "gender": event.get("gender"),
+                "event_id": event.get("event_id"),
+                "event_name": event.get("event_name"),
+                "round": event.get("round"),
+                "round_num": event.get("round_num"),
+                "heat": event.get("heat"),
+                "wind": event.get("wind"),
+                "place": _place(row.get("place")),
+                "athlete_id": row.get("athlete_id"),
+                "athlete_name": row.get("athlete_name"),
+                "year": row.get("year"),
+                "team_slug": row.get("team_slug"),
+                "team_name": row.get("team_name"),
+                "mark": row.get("mark"),
+                "mark_seconds": _seconds(row.get("mark_seconds"), row.get("mark")),
+            }
+
+
+def athlete_rows(athlete_id, data):
+    """One row per result of a `get_athlete_details` document."""
+    athlete = {
+        "athlete_id": str(athlete_id),
+        "athlete_name": data.get("athlete_name"),
+        "gender": data.get("gender"),
+        "team_slug": data.get("current_team_slug"),
+        "team_name": data.get("current_team_name"),
+    }
+    for row in data.get("results", []):
+        yield {
+            **athlete,
+            "meet_id": row.get("meet_id"),
+            "meet_name": row.get("meet_name"),
+            "meet_date": parse_meet_date(row.get("date")),
+            "meet_type": row.get("meet_type"),
+            "event_id": row.get("event_id"),
+            "event_name": row.get("event_name"),
+            "round": row.get("round"),
+            "place": _place(row.get("place")),
+            "mark": row.get("mark"),
+            "mark_seconds": _seconds(row.get("mark_int"), row.get("mark")),
+        }
+
+
+# ---------- Scraping ---------- #
+
+def iter_scraped(keys, scrape, concurrency: int = BATCH_CONCURRENCY):
+    """
+    Yield (key, data) for each key in order, with at most `concurrency`
+    scrapes in flight; failures and empty results are logged and skipped.
+    Unlike `iter_batch`, nothing runs ahead of a slow consumer.
+    """
+    keys = iter(keys)
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as pool:
+        window = deque()
+        for key in keys:
+            window.append((key, pool.submit(scrape, key)))
+            if len(window) >= concurrency:
+                break
+        while window:
+            key, future = window.popleft()
+            next_key = next(keys, None)
+            if next_key is not None:
+                window.append((next_key, pool.submit(scrape, next_key)))
+            try:
+                data = future.result()
+            except Exception as e:
+                logger.warning("Export skipped %s: %s", key, e)
+                continue
+            if data:
+                yield key, data
+            else:
+                logger.warning("Export skipped %s: no data", key)
+
+
+# ---------- Writing ---------- #
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only file object that collects bytes until they are drained."""
+
+    def __init__(self):
+        self._chunks = []
+        self._position = 0
+
+    def writable(self):
+        return True
+
+    def write(self, b):
+        self._chunks.append(bytes(b))
+        self._position += len(b)
+        return len(b)
+
+    def tell(self):
+        return self._position
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def iter_record_batches(rows, schema, batch_rows: int = EXPORT_BATCH_ROWS):
+    """Group row dicts into record batches of at most `batch_rows` rows."""
+    pa = _pyarrow()
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= batch_rows:
+            yield pa.RecordBatch.from_pylist(batch, schema=schema)
+            batch = []
+    if batch:
+        yield pa.RecordBatch.from_pylist(batch, schema=schema)
+
+
+def iter_export(rows, schema, fmt: str, batch_rows: int = EXPORT_BATCH_ROWS):
+    """Encode row dicts as `fmt` ("arrow", "parquet" or "csv"), yielding bytes after every record batch."""
+    pa = _pyarrow()
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format '{fmt}'")
+
+    sink = _ChunkSink()
+    if fmt == "arrow":
+        writer = pa.ipc.new_stream(sink, schema)
+    elif fmt == "parquet":
+        writer = pa.parquet.ParquetWriter(sink, schema, compression="zstd")
+    else:
+        writer = pa.csv.CSVWriter(sink, schema)
+
+    count = 0
+    try:
+        for batch in iter_record_batches(rows, schema, batch_rows):
+            writer.write_batch(batch)
+            count += batch.num_rows
+            if chunk := sink.drain():
+                yield chunk
+    finally:
+        writer.close()
+    logger.info("Exported %s rows as %s", count, fmt)
+    yield sink.drain()
+
+
+def export_meets(meets, scrape, fmt: str, concurrency: int = BATCH_CONCURRENCY):
+    """Scrape meet selections (dicts with `meet_id`) with `scrape(meet)` and stream them as `fmt`."""
+    rows = (
+        row
+        for meet, data in iter_scraped(meets, scrape, concurrency)
+        for row in meet_rows(meet["meet_id"], data)
+    )
+    return iter_export(rows, meet_schema(), fmt)
+
+
+def export_athletes(athlete_ids, scrape, fmt: str, concurrency: int = BATCH_CONCURRENCY):
+    """Scrape athletes with `scrape(athlete_id)` and stream their results as `fmt`."""
+    rows = (
+        row
+        for athlete_id, data in iter_scraped(athlete_ids, scrape, concurrency)
+        for row in athlete_rows(athlete_id, data)
+    )
+    return iter_export(rows, athlete_schema(), fmt)
+
+
+# ---------- CLI ---------- #
+
+def main():
+    from functools import partial
+    from fastapi import HTTPException
+    from api.routes.athletes import scrape_athlete
+    from api.routes.meets import resolve_batch_meets, scrape_batch_meet
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("kind", choices=["meets", "athletes"])
+    parser.add_argument("ids", nargs="*", help="meet or athlete IDs")
+    parser.add_argument("--sport", choices=["tf", "xc"], help="sport of the given meet IDs (default tf), or filter")
+    parser.add_argument("--gender", choices=["m", "f", "both"], default="both", help="track meet gender")
+    parser.add_argument("--query", help="select meets with a live TFRRS meet search")
+    parser.add_argument("--start-date", type=date.fromisoformat, help="select meets on or after (YYYY-MM-DD)")
+    parser.add_argument("--end-date", type=date.fromisoformat, help="select meets on or before (YYYY-MM-DD)")
+    parser.add_argument("--limit", type=int, default=500, help="maximum number of selected meets")
+    parser.add_argument("--concurrency", type=int, default=BATCH_CONCURRENCY)
+    parser.add_argument("--format", choices=list(EXPORT_FORMATS), help="default: from the output extension")
+    parser.add_argument("--output", required=True, help="output file ('-' for stdout)")
+    args = parser.parse_args()
+
+    fmt = args.format or os.path.splitext(args.output)[1].lstrip(".").replace("ipc", "arrow") or "parquet"
+    if fmt not in EXPORT_FORMATS:
+        parser.error(f"cannot infer the format from '{args.output}'; pass --format")
+
+    if args.kind == "athletes":
+        chunks = export_athletes(args.ids, scrape_athlete, fmt, args.concurrency)
+    else:
+        if args.ids:
+            meets = [{"meet_id": meet_id, "sport": args.sport or "tf"} for meet_id in args.ids]
+        else:
+            try:
+                meets = resolve_batch_meets(args.query, args.start_date, args.end_date, args.sport, args.limit)
+            except HTTPException as e:
+                parser.error(e.detail)
+        chunks = export_meets(meets, partial(scrape_batch_meet, gender=args.gender), fmt, args.concurrency)
+
+    out = sys.stdout.buffer if args.output == "-" else open(args.output, "wb")
+    try:
+        for chunk in chunks:
+            out.write(chunk)
+    finally:
+        if out is not sys.stdout.buffer:
+            out.close()
+
+
+if __name__ == "__main__":
+    main()
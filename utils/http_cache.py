@@ -0,0 +1,131 @@
+import gzip
+import os
+import threading
+from collections import OrderedDict
+from fastapi import Request, Response
+from starlette.concurrency import run_in_threadpool
+from utils.cache_backend import cached_etag, content_etag
+
+# Responses smaller than this many bytes are sent uncompressed
+COMPRESS_MIN_SIZE = int(os.getenv("COMPRESS_MIN_SIZE", "1024"))
+
+# Mid-range levels: most of the size win at a fraction of the CPU of the maximums
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+
+# Compressed bodies kept per process, keyed by (ETag, encoding), so polling
+# clients that do not send If-None-Match are not recompressed every time
+COMPRESSED_CACHE_SIZE = 128
+
+# Streams and bulk exports are passed through untouched (buffering them would defeat streaming)
+STREAMING_TYPES = (
+    "text/event-stream", "application/x-ndjson",
+    "application/vnd.apache.arrow.stream", "application/vnd.apache.parquet", "text/csv",
+)
+
+_compressed = OrderedDict()
+_compressed_lock = threading.Lock()
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Weak comparison of an If-None-Match header against an ETag."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == opaque for tag in if_none_match.split(","))
+
+
+def not_modified(request: Request, cache_key: str) -> Response | None:
+    """
+    304 response when the client already holds the payload cached under
+    `cache_key`; lets a route skip loading and serializing it entirely.
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return None
+    etag = cached_etag(cache_key)
+    if etag and etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers={"ETag": etag, "Vary": "Accept-Encoding"})
+    return None
+
+
+def choose_encoding(accept_encoding: str | None) -> str | None:
+    """Pick brotli, then gzip, from an Accept-Encoding header (q=0 means refused)."""
+    accepted = set()
+    for item in (accept_encoding or "").lower().split(","):
+        name, _, params = item.strip().partition(";")
+        q = params.strip().removeprefix("q=")
+        try:
+            if params and float(q) <= 0:
+                continue
+        except ValueError:
+            continue
+        accepted.add(name.strip())
+
+    if "br" in accepted or "*" in accepted:
+        try:
+            import brotli  # noqa: F401
+            return "br"
+        except ImportError:
+            pass
+    if "gzip" in accepted or "*" in accepted:
+        return "gzip"
+    return None
+
+
+def compress(body: bytes, encoding: str, etag: str) -> bytes:
+    """Compress a body, reusing the result for the same ETag and encoding."""
+    key = (etag, encoding)
+    with _compressed_lock:
+        if key in _compressed:
+            _compressed.move_to_end(key)
+            return _compressed[key]
+
+    if encoding == "br":
+        import brotli
+        compressed = brotli.compress(body, quality=BROTLI_QUALITY)
+    else:
+        compressed = gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0)
+
+    with _compressed_lock:
+        _compressed[key] = compressed
+        while len(_compressed) > COMPRESSED_CACHE_SIZE:
+            _compressed.popitem(last=False)
+    return compressed
+
+
+async def conditional_response(request: Request, response: Response) -> Response:
+    """
+    Give a finished response a content-hash ETag, answer a matching
+    If-None-Match with 304, and otherwise compress it when the client
+    accepts it and the body is large enough. Only successful GETs with
+    non-streaming bodies are touched.
+    """
+    content_type = response.headers.get("content-type", "")
+    if (
+        request.method != "GET"
+        or response.status_code != 200
+        or "content-encoding" in response.headers
+        or content_type.startswith(STREAMING_TYPES)
+    ):
+        return response
+
+    body = b"".join([chunk async for chunk in response.body_iterator])
+    etag = content_etag(body)
+    headers = {
+        k: v for k, v in response.headers.items() if k not in ("content-length", "etag", "vary")
+    }
+    headers.update({"ETag": etag, "Vary": "Accept-Encoding"})
+
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        headers.pop("content-type", None)
+        return Response(status_code=304, headers=headers, background=response.background)
+
+    encoding = choose_encoding(request.headers.get("accept-encoding"))
+    if encoding and len(body) >= COMPRESS_MIN_SIZE:
+        body = await run_in_threadpool(compress, body, encoding, etag)
+        headers["Content-Encoding"] = encoding
+
+    return Response(content=body, status_code=200, headers=headers, background=response.background)
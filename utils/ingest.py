@@ -0,0 +1,27 @@
+from utils.leaderboards import index_meet_marks, index_team_conference
+from utils.roster_index import index_athlete, index_meet, index_roster
+from utils.search_index import index_athlete_names, index_meet_names, index_roster_names, index_search_results
+
+# Single hook called by every scraper after a successful parse, so each local
+# index (roster, search, ...) is fed from one place.
+
+
+def ingest_roster(team_url: str, data):
+    index_roster(team_url, data)
+    index_roster_names(team_url, data)
+    index_team_conference(team_url, data)
+
+
+def ingest_athlete(athlete_url: str, data):
+    index_athlete(athlete_url, data)
+    index_athlete_names(athlete_url, data)
+
+
+def ingest_meet(meet_url: str, data):
+    index_meet(data)
+    index_meet_names(meet_url, data)
+    index_meet_marks(meet_url, data)
+
+
+def ingest_search(query_type: str, results):
+    index_search_results(query_type, results)
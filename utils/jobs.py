@@ -0,0 +1,180 @@
+import copy
+import os
+import threading
+import time
+import uuid
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from utils.cache_backend import get_backend
+from utils.logging_config import get_logger
+from utils.progress import reporting_to
+
+logger = get_logger(__name__)
+
+# Scrapes run at once per API worker process, and jobs (queued + running)
+# accepted per process before POST /jobs starts answering 503
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "4"))
+JOB_QUEUE_DEPTH = int(os.getenv("JOB_QUEUE_DEPTH", "50"))
+
+# Finished jobs (status + result) are kept JOB_RETENTION seconds, and at most
+# JOB_MAX_RETAINED per process; the oldest are evicted first
+JOB_RETENTION = float(os.getenv("JOB_RETENTION", "3600"))
+JOB_MAX_RETAINED = int(os.getenv("JOB_MAX_RETAINED", "200"))
+
+# Progress is written to the shared backend (and cancellation checked) at most this often
+PROGRESS_INTERVAL = 0.5
+
+FINISHED = ("succeeded", "failed", "cancelled")
+
+
+class JobQueueFull(Exception):
+    """Raised by `submit` when this process already holds JOB_QUEUE_DEPTH unfinished jobs."""
+
+
+class JobCancelled(Exception):
+    """Raised inside a running job once its cancellation has been requested."""
+
+
+class _ProgressReporter:
+    """Collects `advance` counts for one job; flushes them and checks for cancellation periodically."""
+
+    def __init__(self, manager, job):
+        self.manager = manager
+        self.job = job
+        self._lock = threading.Lock()
+        self._last_flush = time.monotonic()
+
+    def __call__(self, counter: str, n: int):
+        with self._lock:
+            progress = self.job["progress"]
+            progress[counter] = progress.get(counter, 0) + n
+            if time.monotonic() - self._last_flush < PROGRESS_INTERVAL:
+                return
+            self._last_flush = time.monotonic()
+            # Parser threads keep advancing (and adding counters) while the copy is saved
+            snapshot = copy.deepcopy(self.job)
+        self.manager._save(snapshot)
+        if self.manager.cancel_requested(self.job["id"]):
+            raise JobCancelled()
+
+
+class JobManager:
+    """
+    Runs scrapes in a per-process thread pool on behalf of the /jobs API.
+
+    Job records, results and cancellation flags live in the shared cache
+    backend, so any worker process can answer a poll or cancel a job that
+    another worker is running.
+    """
+
+    def __init__(self, workers: int = JOB_WORKERS, depth: int = JOB_QUEUE_DEPTH):
+        self.workers = workers
+        self.depth = depth
+        self._lock = threading.Lock()
+        self._pool = None
+        self._unfinished = 0
+        self._retained = deque()
+
+    def _save(self, job):
+        get_backend().set(f"job:{job['id']}", job, JOB_RETENTION)
+
+    def submit(self, job_type: str, params: dict, run) -> dict:
+        """Queue `run()` as a job; returns the job record. Raises JobQueueFull when saturated."""
+        with self._lock:
+            if self._unfinished >= self.depth:
+                raise JobQueueFull(f"{self._unfinished} jobs already queued or running")
+            self._unfinished += 1
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="job")
+
+        job = {
+            "id": uuid.uuid4().hex,
+            "type": job_type,
+            "params": params,
+            "status": "queued",
+            "created_at": time.time(),
+            "started_at": None,
+            "finished_at": None,
+            "progress": {},
+            "error": None,
+        }
+        snapshot = copy.deepcopy(job)  # `_run` mutates `job` from the pool thread
+        try:
+            self._save(job)
+            self._pool.submit(self._run, job, run)
+        except Exception:
+            with self._lock:
+                self._unfinished -= 1
+            raise
+        logger.info("Queued %s job %s", job_type, job["id"])
+        return snapshot
+
+    def get(self, job_id: str) -> dict | None:
+        return get_backend().get(f"job:{job_id}")
+
+    def result(self, job_id: str):
+        return get_backend().get(f"job:{job_id}:result")
+
+    def cancel_requested(self, job_id: str) -> bool:
+        return bool(get_backend().get(f"job:{job_id}:cancel"))
+
+    def cancel(self, job_id: str) -> dict | None:
+        """Request cancellation; a queued job is cancelled at once, a running one at its next progress check."""
+        job = self.get(job_id)
+        if job is None or job["status"] in FINISHED:
+            return job
+        get_backend().set(f"job:{job_id}:cancel", True, JOB_RETENTION)
+        if job["status"] == "queued":
+            job.update(status="cancelled", finished_at=time.time())
+            self._save(job)
+        return job
+
+    def _run(self, job, run):
+        try:
+            if self.cancel_requested(job["id"]):
+                job.update(status="cancelled", finished_at=time.time())
+                return
+
+            job.update(status="running", started_at=time.time())
+            self._save(job)
+            with reporting_to(_ProgressReporter(self, job)):
+                result = run()
+
+            if self.cancel_requested(job["id"]):
+                job["status"] = "cancelled"
+            elif not result:
+                job.update(status="failed", error="No data found")
+            else:
+                get_backend().set(f"job:{job['id']}:result", result, JOB_RETENTION)
+                job["status"] = "succeeded"
+        except Exception as e:
+            if isinstance(e, JobCancelled) or self.cancel_requested(job["id"]):
+                job["status"] = "cancelled"
+            else:
+                logger.warning("Job %s failed: %s", job["id"], e)
+                job.update(status="failed", error=str(e))
+        finally:
+            job["finished_at"] = job["finished_at"] or time.time()
+            try:
+                self._save(job)
+            except Exception as e:
+                logger.warning("Failed to save job %s: %s", job["id"], e)
+            logger.info("Job %s %s", job["id"], job["status"])
+            self._finish(job["id"])
+
+    def _finish(self, job_id):
+        with self._lock:
+            self._unfinished -= 1
+            self._retained.append(job_id)
+            evicted = [self._retained.popleft() for _ in range(len(self._retained) - JOB_MAX_RETAINED)]
+        for old_id in evicted:
+            backend = get_backend()
+            for key in (f"job:{old_id}", f"job:{old_id}:result", f"job:{old_id}:cancel"):
+                backend.delete(key)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"unfinished": self._unfinished, "queue_depth": self.depth, "workers": self.workers}
+
+
+job_manager = JobManager()
@@ -0,0 +1,272 @@
+import bisect
+import threading
+import time
+from collections import defaultdict
+from utils.common import extract_meet_id, extract_team_slug
+from utils.db import DB_PATH, INDEX_REFRESH_INTERVAL, connect
+from utils.logging_config import get_logger
+from utils.meet_batch import parse_meet_date
+
+logger = get_logger(__name__)
+
+# Key of the leaderboard spanning every conference (teams whose conference is
+# not known yet only appear there)
+ALL_CONFERENCES = None
+
+MARK_COLUMNS = ("season", "event_name", "gender", "athlete_id", "team_slug", "mark_seconds",
+                "mark", "athlete_name", "team_name", "meet_id", "meet_name", "meet_date")
+
+
+class Leaderboard:
+    """
+    Each athlete's best mark on one board, kept in a list sorted by mark
+    (fastest first), so top-K is a slice and each new mark is one bisect.
+    """
+
+    def __init__(self):
+        self.best = {}   # athlete_id -> entry
+        self.order = []  # sorted (mark_seconds, athlete_id)
+
+    def offer(self, entry: dict) -> bool:
+        """Keep `entry` if it beats the athlete's current best; returns whether it did."""
+        athlete_id = entry["athlete_id"]
+        current = self.best.get(athlete_id)
+        if current is not None:
+            if current["mark_seconds"] <= entry["mark_seconds"]:
+                return False
+            del self.order[bisect.bisect_left(self.order, (current["mark_seconds"], athlete_id))]
+        self.best[athlete_id] = entry
+        bisect.insort(self.order, (entry["mark_seconds"], athlete_id))
+        return True
+
+    def top(self, k: int) -> list:
+        return [self.best[athlete_id] for _, athlete_id in self.order[:k]]
+
+    def __len__(self):
+        return len(self.order)
+
+
+class LeaderboardIndex:
+    """
+    Season leaderboards per (event_name, gender, conference), built from
+    every scraped track meet.
+
+    Each meet only touches the boards of the marks it contains; a team's
+    marks move onto its conference board when a roster scrape first reports
+    the conference. Every athlete's best mark per season, event, gender and
+    team is written through to SQLite and the boards are rebuilt from it on
+    first use; marks and conferences recorded by other worker processes are
+    picked up every INDEX_REFRESH_INTERVAL seconds (by rowid).
+    """
+
+    def __init__(self, db_path: str = DB_PATH):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._conn = None
+        self._boards = defaultdict(Leaderboard)  # (season, event_name, gender, conference) -> board
+        self._conferences = {}                   # team_slug -> conference
+        self._team_marks = defaultdict(dict)     # team_slug -> {(season, event, gender, athlete_id): best entry}
+        self._last_mark_rowid = 0
+        self._last_conference_rowid = 0
+        self._refreshed_at = 0.0
+
+    def _ensure_loaded(self):
+        if self._conn is not None:
+            if time.monotonic() - self._refreshed_at >= INDEX_REFRESH_INTERVAL:
+                self._load_new_rows()
+            return
+        conn = connect(self.db_path)
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS best_marks ("
+            "season INTEGER NOT NULL, event_name TEXT NOT NULL, gender TEXT NOT NULL, "
+            "athlete_id TEXT NOT NULL, team_slug TEXT NOT NULL, mark_seconds REAL NOT NULL, "
+            "mark TEXT, athlete_name TEXT, team_name TEXT, meet_id TEXT, meet_name TEXT, meet_date TEXT, "
+            "PRIMARY KEY (season, event_name, gender, athlete_id, team_slug))"
+        )
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS team_conferences (team_slug TEXT PRIMARY KEY, conference TEXT NOT NULL)"
+        )
+        conn.commit()
+        self._conn = conn
+        count = self._load_new_rows()
+        logger.info("Loaded leaderboards (%s marks, %s boards)", count, len(self._boards))
+
+    def _load_new_rows(self) -> int:
+        """
+        File conferences and best marks written since the last load, by this or
+        any other worker; both tables are written with INSERT OR REPLACE, so an
+        improved mark or changed conference gets a new, higher rowid.
+        """
+        conferences = self._conn.execute(
+            "SELECT rowid, team_slug, conference FROM team_conferences WHERE rowid > ? ORDER BY rowid",
+            (self._last_conference_rowid,),
+        ).fetchall()
+        for _, team_slug, conference in conferences:
+            self._apply_conference(team_slug, conference)
+        if conferences:
+            self._last_conference_rowid = conferences[-1][0]
+
+        marks = self._conn.execute(
+            f"SELECT rowid, {', '.join(MARK_COLUMNS)} FROM best_marks WHERE rowid > ? ORDER BY rowid",
+            (self._last_mark_rowid,),
+        ).fetchall()
+        for row in marks:
+            self._file(dict(zip(MARK_COLUMNS, row[1:])))
+        if marks:
+            self._last_mark_rowid = marks[-1][0]
+        self._refreshed_at = time.monotonic()
+        return len(marks)
+
+    def _file(self, entry: dict) -> bool:
+        """
+        Keep an entry if it is the athlete's best for their team, and offer it
+        to the all-conference board and the team's conference board.
+        Returns False (touching nothing) when the team already has a better mark.
+        """
+        key = (entry["season"], entry["event_name"], entry["gender"])
+        team_marks = self._team_marks[entry["team_slug"]]
+        current = team_marks.get((*key, entry["athlete_id"]))
+        if current is not None and current["mark_seconds"] <= entry["mark_seconds"]:
+            return False
+        team_marks[(*key, entry["athlete_id"])] = entry
+
+        self._boards[(*key, ALL_CONFERENCES)].offer(entry)
+        conference = self._conferences.get(entry["team_slug"])
+        if conference:
+            self._boards[(*key, conference)].offer(entry)
+        return True
+
+    def add_marks(self, entries) -> int:
+        """Record mark entries (one dict per result row); returns how many were new bests."""
+        with self._lock:
+            self._ensure_loaded()
+            improved = [entry for entry in entries if self._file(entry)]
+            if not improved:
+                return 0
+            # Replaced (not updated in place) so the row gets a new rowid other
+            # workers pick up; a better mark already stored by another worker wins
+            self._conn.executemany(
+                f"INSERT OR REPLACE INTO best_marks ({', '.join(MARK_COLUMNS)}) "
+                f"SELECT {', '.join(':' + column for column in MARK_COLUMNS)} "
+                "WHERE NOT EXISTS (SELECT 1 FROM best_marks WHERE season = :season AND event_name = :event_name "
+                "AND gender = :gender AND athlete_id = :athlete_id AND team_slug = :team_slug "
+                "AND mark_seconds <= :mark_seconds)",
+                improved,
+            )
+            self._conn.commit()
+            return len(improved)
+
+    def set_conference(self, team_slug: str, conference: str) -> bool:
+        """Record a team's conference and file its marks on that board; returns whether it changed."""
+        with self._lock:
+            self._ensure_loaded()
+            previous = self._conferences.get(team_slug)
+            if previous == conference:
+                return False
+            self._conn.execute(
+                "INSERT OR REPLACE INTO team_conferences (team_slug, conference) VALUES (?, ?)",
+                (team_slug, conference),
+            )
+            self._conn.commit()
+            self._apply_conference(team_slug, conference)
+            return True
+
+    def _apply_conference(self, team_slug: str, conference: str):
+        """Move a team's marks onto its conference's boards."""
+        previous = self._conferences.get(team_slug)
+        if previous == conference:
+            return
+        self._conferences[team_slug] = conference
+
+        if previous:
+            # Rare (realignment): rebuild just the old conference's boards without this team
+            for key in [key for key in self._boards if key[3] == previous]:
+                del self._boards[key]
+            for slug, team_marks in self._team_marks.items():
+                if self._conferences.get(slug) == previous:
+                    for entry in team_marks.values():
+                        self._boards[(entry["season"], entry["event_name"], entry["gender"], previous)].offer(entry)
+        for entry in self._team_marks.get(team_slug, {}).values():
+            self._boards[(entry["season"], entry["event_name"], entry["gender"], conference)].offer(entry)
+
+    def top(self, event_name: str, gender: str, conference: str | None = ALL_CONFERENCES,
+            season: int | None = None, k: int = 25) -> list:
+        """The `k` fastest athletes (best mark each) for one board; `season` defaults to the latest one."""
+        with self._lock:
+            self._ensure_loaded()
+            if season is None:
+                seasons = [key[0] for key in self._boards if key[1:] == (event_name, gender, conference)]
+                if not seasons:
+                    return []
+                season = max(seasons)
+            board = self._boards.get((season, event_name, gender, conference))
+            if board is None:
+                return []
+            return [{"rank": i, **entry} for i, entry in enumerate(board.top(k), start=1)]
+
+    def boards(self, season: int | None = None, conference: str | None = ALL_CONFERENCES) -> list:
+        """Every board for one conference (and season, if given), with its size."""
+        with self._lock:
+            self._ensure_loaded()
+            return sorted(
+                ({"season": s, "event_name": e, "gender": g, "conference": c, "athletes": len(board)}
+                 for (s, e, g, c), board in self._boards.items()
+                 if c == conference and (season is None or s == season)),
+                key=lambda b: (-b["season"], b["gender"], b["event_name"]),
+            )
+
+    def conferences(self) -> list:
+        with self._lock:
+            self._ensure_loaded()
+            return sorted(set(self._conferences.values()))
+
+
+leaderboard_index = LeaderboardIndex()
+
+
+# ---------- Scrape Feeders ---------- #
+
+def index_meet_marks(meet_url: str, data):
+    """Feed every timed result of a track `get_meet_results` result into the leaderboards."""
+    if not data or data.get("meet_type") != "tf":
+        return
+    meet_date = parse_meet_date(data.get("meet_date"))
+    if meet_date is None:
+        return
+    entries = [
+        {
+            "season": meet_date.year,
+            "event_name": event["event_name"],
+            "gender": event["gender"],
+            "athlete_id": str(row["athlete_id"]),
+            "team_slug": row.get("team_slug") or "",
+            "mark_seconds": row["mark_seconds"],
+            "mark": row.get("mark"),
+            "athlete_name": row.get("athlete_name"),
+            "team_name": row.get("team_name"),
+            "meet_id": extract_meet_id(meet_url),
+            "meet_name": data.get("meet_name"),
+            "meet_date": meet_date.isoformat(),
+        }
+        for event in data.get("events", [])
+        if event.get("event_name") and event.get("gender")
+        for row in event.get("results", [])
+        if row.get("athlete_id") and isinstance(row.get("mark_seconds"), (int, float)) and row["mark_seconds"] > 0
+    ]
+    try:
+        improved = leaderboard_index.add_marks(entries)
+        logger.debug("Indexed marks for %s: %s new bests of %s", data.get("meet_name"), improved, len(entries))
+    except Exception as e:
+        logger.warning("Failed to index marks for %s: %s", data.get("meet_name"), e)
+
+
+def index_team_conference(team_url: str, data):
+    """Feed the conference of a `get_team_roster` result into the leaderboards."""
+    team_slug = extract_team_slug(team_url)
+    if not data or not team_slug or not data.get("conference"):
+        return
+    try:
+        if leaderboard_index.set_conference(team_slug, data["conference"]):
+            logger.debug("Team %s is in %s", team_slug, data["conference"])
+    except Exception as e:
+        logger.warning("Failed to index conference for %s: %s", team_slug, e)
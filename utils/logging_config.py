@@ -1,30 +1,207 @@
-import os
+import atexit
 import logging
-from logging.handlers import RotatingFileHandler
+import multiprocessing
+import os
+import queue
+import threading
+import time
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+
+LOG_FILE = os.getenv("LOG_FILE", os.path.join("logs", "tfrrs.log"))
+
+# Rotation is not safe across processes, so under gunicorn (see gunicorn.conf.py)
+# each worker writes and rotates its own file, e.g. logs/tfrrs.12345.log
+LOG_FILE_PER_PROCESS = os.getenv("LOG_FILE_PER_PROCESS", "0") == "1"
+
+# Default level for every module logger, plus per-module overrides, e.g.
+#   LOG_LEVELS="scrapers.getMeetDetails=DEBUG,utils.search_index=WARNING"
+# An override applies to the named module and everything below it; an unknown
+# level name falls back to INFO (with a warning) instead of failing at import.
+LOG_LEVELS = os.getenv("LOG_LEVELS", "")
+
+
+def _valid_level(level: str, source: str) -> str:
+    level = level.strip().upper()
+    if isinstance(logging.getLevelName(level), int):
+        return level
+    logging.getLogger(__name__).warning("Unknown log level %r in %s; using INFO", level, source)
+    return "INFO"
+
+
+LOG_LEVEL = _valid_level(os.getenv("LOG_LEVEL", "INFO"), "LOG_LEVEL")
+
+# Sampled loggers let through LOG_SAMPLE_BURST records per message template
+# every LOG_SAMPLE_INTERVAL seconds and count the rest
+LOG_SAMPLE_BURST = int(os.getenv("LOG_SAMPLE_BURST", "10"))
+LOG_SAMPLE_INTERVAL = float(os.getenv("LOG_SAMPLE_INTERVAL", "1.0"))
+
+_queue_handler = None
+_handlers = ()
+_worker_queue = None
+_pipeline_lock = threading.Lock()
+
+
+class LazyRotatingFileHandler(RotatingFileHandler):
+    """Rotating file handler that only creates its directory and file when the first record arrives."""
+
+    def __init__(self, filename, **kwargs):
+        super().__init__(filename, delay=True, **kwargs)
+
+    def _open(self):
+        os.makedirs(os.path.dirname(self.baseFilename), exist_ok=True)
+        return super()._open()
+
+
+def log_path() -> str:
+    """This process's log file: LOG_FILE, with the pid before the extension when LOG_FILE_PER_PROCESS is set."""
+    if not LOG_FILE_PER_PROCESS:
+        return LOG_FILE
+    root, ext = os.path.splitext(LOG_FILE)
+    return f"{root}.{os.getpid()}{ext}"
+
+
+def _get_queue_handler() -> QueueHandler:
+    """
+    Build the shared logging pipeline once per process: every module logger
+    enqueues records, and a single background listener writes them to one
+    rotating file and the console, so request threads never block on disk.
+    """
+    global _queue_handler, _handlers
+    with _pipeline_lock:
+        if _queue_handler is None:
+            formatter = logging.Formatter(
+                "%(asctime)s [%(levelname)s] %(name)s: %(message)s", datefmt="%H:%M:%S"
+            )
+
+            file_handler = LazyRotatingFileHandler(log_path(), maxBytes=5_000_000, backupCount=5)
+            file_handler.setLevel(logging.DEBUG)
+            file_handler.setFormatter(formatter)
+
+            console_handler = logging.StreamHandler()
+            console_handler.setLevel(logging.INFO)
+            console_handler.setFormatter(formatter)
+
+            _handlers = (file_handler, console_handler)
+            log_queue = queue.SimpleQueue()
+            listener = QueueListener(log_queue, *_handlers, respect_handler_level=True)
+            listener.start()
+            atexit.register(listener.stop)
 
-def get_logger(name: str, log_filename: str) -> logging.Logger:
-    """Return a rotating file + console logger."""
-    log_dir = "logs"
-    os.makedirs(log_dir, exist_ok=True)
-    log_path = os.path.join(log_dir, log_filename)
+            _queue_handler = QueueHandler(log_queue)
+        return _queue_handler
 
+
+# ---------- Worker Processes ---------- #
+
+def worker_log_queue():
+    """
+    Queue that process-pool workers log to (see `init_worker_logging`); a
+    listener in this process writes their records through the same handlers.
+    """
+    global _worker_queue
+    _get_queue_handler()
+    with _pipeline_lock:
+        if _worker_queue is None:
+            _worker_queue = multiprocessing.Queue()
+            listener = QueueListener(_worker_queue, *_handlers, respect_handler_level=True)
+            listener.start()
+            atexit.register(listener.stop)
+        return _worker_queue
+
+
+def init_worker_logging(log_queue):
+    """
+    ProcessPoolExecutor initializer. A forked child inherits the parent's
+    queue handler but not its listener thread, so records would pile up
+    unwritten; send them back to the parent over `log_queue` instead.
+    """
+    global _queue_handler, _pipeline_lock
+    _pipeline_lock = threading.Lock()  # may have been held by another thread at fork time
+    handler = QueueHandler(log_queue)
+    previous, _queue_handler = _queue_handler, handler
+    for logger in list(logging.Logger.manager.loggerDict.values()):
+        if isinstance(logger, logging.Logger) and previous is not None and previous in logger.handlers:
+            logger.removeHandler(previous)
+            logger.addHandler(handler)
+
+
+def pool_logging_kwargs() -> dict:
+    """ProcessPoolExecutor keyword arguments that route worker logs to this process."""
+    return {"initializer": init_worker_logging, "initargs": (worker_log_queue(),)}
+
+
+def _parse_level_overrides(spec: str) -> dict:
+    overrides = {}
+    for item in spec.split(","):
+        module, _, level = item.partition("=")
+        if module.strip() and level.strip():
+            overrides[module.strip()] = _valid_level(level, "LOG_LEVELS")
+    return overrides
+
+
+_level_overrides = _parse_level_overrides(LOG_LEVELS)
+
+def level_for(name: str) -> str:
+    """Resolve the configured level for a logger name (longest matching override wins)."""
+    matches = [m for m in _level_overrides if name == m or name.startswith(m + ".")]
+    return _level_overrides[max(matches, key=len)] if matches else LOG_LEVEL
+
+
+def get_logger(name: str) -> logging.Logger:
+    """Return a module logger attached to the shared queue-based file + console pipeline."""
     logger = logging.getLogger(name)
-    logger.setLevel(logging.DEBUG)
+    logger.setLevel(level_for(name))
 
     if not logger.handlers:
-        file_handler = RotatingFileHandler(log_path, maxBytes=5_000_000, backupCount=5)
-        file_handler.setLevel(logging.DEBUG)
+        logger.addHandler(_get_queue_handler())
+
+    return logger
 
-        console_handler = logging.StreamHandler()
-        console_handler.setLevel(logging.INFO)
 
-        formatter = logging.Formatter(
-            "%(asctime)s [%(levelname)s] %(message)s", datefmt="%H:%M:%S"
-        )
-        file_handler.setFormatter(formatter)
-        console_handler.setFormatter(formatter)
+# ---------- Sampling ---------- #
 
-        logger.addHandler(file_handler)
-        logger.addHandler(console_handler)
+class SampledLogger(logging.LoggerAdapter):
+    """
+    Rate-limited view of a module logger for per-row and per-event messages.
 
-    return logger
+    For each message template the first `burst` records in every `interval`
+    seconds go through; the rest are dropped *before* a LogRecord is built
+    and counted, and the next record that passes reports how many were
+    suppressed. Templates are the unformatted `%`-style messages, so every
+    row of a loop logging "Skipping relay event: %s" shares one budget.
+    Only DEBUG and INFO are sampled; warnings and errors always go through.
+    """
+
+    def __init__(self, logger, burst: int = LOG_SAMPLE_BURST, interval: float = LOG_SAMPLE_INTERVAL):
+        super().__init__(logger, {})
+        self.burst = burst
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._windows = {}
+
+    def log(self, level, msg, *args, **kwargs):
+        if not self.isEnabledFor(level):
+            return
+        if level > logging.INFO:
+            self.logger.log(level, msg, *args, **kwargs)
+            return
+
+        key = (level, msg)
+        now = time.monotonic()
+        with self._lock:
+            window_start, passed, suppressed = self._windows.get(key, (now, 0, 0))
+            if now - window_start >= self.interval:
+                window_start, passed = now, 0
+            if passed >= self.burst:
+                self._windows[key] = (window_start, passed, suppressed + 1)
+                return
+            self._windows[key] = (window_start, passed + 1, 0)
+
+        if suppressed:
+            msg = f"{msg} (+{suppressed} similar suppressed)"
+        self.logger.log(level, msg, *args, **kwargs)
+
+
+def get_sampled_logger(name: str) -> SampledLogger:
+    """Return a rate-limited adapter over the module logger `name` (same level and handlers)."""
+    return SampledLogger(get_logger(name))
@@ -0,0 +1,149 @@
+import json
+import os
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import date, datetime
+from utils.logging_config import get_logger
+from utils.progress import advance, submit_in_context
+
+logger = get_logger(__name__)
+
+# Meets scraped at once by a batch request (track meets with gender=both fetch two pages each)
+BATCH_CONCURRENCY = int(os.getenv("BATCH_CONCURRENCY", "4"))
+
+_NUMERIC_DATE = re.compile(r"(\d{1,2})/(\d{1,2})/(\d{2,4})")
+_MONTH_DAY = re.compile(r"([A-Za-z]{3,})\.?\s+(\d{1,2})")
+_YEAR = re.compile(r"\b(\d{4})\b")
+
+
+# ---------- Meet Selection ---------- #
+
+def parse_meet_date(text) -> date | None:
+    """
+    Parse the start date of a TFRRS meet date string.
+    Handles "April 12, 2025", "Apr 10-12, 2025", "Mar 28 - Apr 1, 2025",
+    "04/12/25" and ISO dates; returns None when nothing matches.
+    """
+    if not text:
+        return None
+    text = text.strip()
+    try:
+        return date.fromisoformat(text[:10])
+    except ValueError:
+        pass
+
+    match = _NUMERIC_DATE.search(text)
+    if match:
+        month, day, year = (int(g) for g in match.groups())
+        year += 2000 if year < 100 else 0
+        try:
+            return date(year, month, day)
+        except ValueError:
+            return None
+
+    match, years = _MONTH_DAY.search(text), _YEAR.findall(text)
+    if not match or not years:
+        return None
+    try:
+        # The year is only printed once, at the end of ranges
+        return datetime.strptime(f"{match.group(1)[:3]} {match.group(2)} {years[-1]}", "%b %d %Y").date()
+    except ValueError:
+        return None
+
+
+def meet_sport(record) -> str:
+    """'xc' or 'tf' for a meet search result or index record."""
+    sport = (record.get("sport") or record.get("meet_type") or "").lower()
+    return "xc" if "xc" in sport or "cross" in sport else "tf"
+
+
+def select_meets(records, start: date | None = None, end: date | None = None, sport: str | None = None) -> list:
+    """
+    Filter meet records by sport and date range (inclusive), dropping
+    duplicates and records without an ID; sorted oldest first. Meets whose
+    date cannot be parsed are excluded whenever a range is given.
+    """
+    selected = {}
+    for record in records:
+        meet_id = record.get("meet_id")
+        if not meet_id or str(meet_id) in selected:
+            continue
+        if sport and meet_sport(record) != sport:
+            continue
+        meet_date = parse_meet_date(record.get("date"))
+        if (start or end) and meet_date is None:
+            continue
+        if (start and meet_date < start) or (end and meet_date > end):
+            continue
+        selected[str(meet_id)] = {
+            "meet_id": str(meet_id),
+            "meet_name": record.get("meet_name"),
+            "date": meet_date.isoformat() if meet_date else record.get("date"),
+            "sport": meet_sport(record),
+        }
+    return sorted(selected.values(), key=lambda m: (m["date"] or "", m["meet_id"]))
+
+
+# ---------- Batch Scraping ---------- #
+
+def _scrape_one(meet, scrape):
+    start = time.time()
+    status = {**meet}
+    try:
+        data = scrape(meet)
+        status.update(status="ok" if data else "not_found", data=data or None)
+    except Exception as e:
+        logger.warning("Batch scrape failed for meet %s: %s", meet["meet_id"], e)
+        status.update(status="error", error=str(e))
+    status["elapsed"] = round(time.time() - start, 3)
+    return status
+
+
+def iter_batch(meets, scrape, concurrency: int = BATCH_CONCURRENCY):
+    """
+    Scrape `meets` with at most `concurrency` in flight, yielding one status
+    dict per meet as it finishes: the meet fields plus `index` (position in
+    `meets`), `status` ("ok", "not_found" or "error"), `elapsed`, and `data`
+    or `error`. Closing the generator early cancels meets not yet started.
+    """
+    pool = ThreadPoolExecutor(max_workers=max(1, concurrency))
+    try:
+        futures = {submit_in_context(pool, _scrape_one, meet, scrape): i for i, meet in enumerate(meets)}
+        for future in as_completed(futures):
+            yield {"index": futures[future], **future.result()}
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def collect_batch(meets, scrape, concurrency: int = BATCH_CONCURRENCY) -> dict:
+    """Run a whole batch and return one document with every meet status in `meets` order."""
+    results = []
+    for result in iter_batch(meets, scrape, concurrency):
+        results.append(result)
+        advance("meets")
+    results.sort(key=lambda r: r["index"])
+    return {
+        "count": len(results),
+        "ok": sum(r["status"] == "ok" for r in results),
+        "failed": sum(r["status"] == "error" for r in results),
+        "meets": results,
+    }
+
+
+def iter_batch_ndjson(meets, scrape, concurrency: int = BATCH_CONCURRENCY):
+    """
+    NDJSON stream of a batch: a `batch` line listing the selected meets,
+    one `meet` line per finished meet, then a `summary` line with counts.
+    """
+    start = time.time()
+    yield json.dumps({"type": "batch", "count": len(meets), "meets": meets}) + "\n"
+
+    counts = {"ok": 0, "not_found": 0, "error": 0}
+    for result in iter_batch(meets, scrape, concurrency):
+        counts[result["status"]] += 1
+        yield json.dumps({"type": "meet", **result}) + "\n"
+
+    elapsed = round(time.time() - start, 3)
+    logger.info("Batch of %s meets finished in %.2fs: %s", len(meets), elapsed, counts)
+    yield json.dumps({"type": "summary", "count": len(meets), **counts, "elapsed": elapsed}) + "\n"
@@ -0,0 +1,148 @@
+import asyncio
+import json
+import os
+import time
+from scrapers.getMeetDetails import get_meet_results
+from utils.cache_backend import cached_scrape
+from utils.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# Seconds between upstream polls of a watched meet (shared by every subscriber)
+POLL_INTERVAL = float(os.getenv("MEET_WATCH_INTERVAL", "10"))
+
+# Messages buffered per subscriber before it is considered too slow and resynced
+SUBSCRIBER_QUEUE_SIZE = 100
+
+# ---------- Diffing ---------- #
+
+def event_key(event):
+    """Identify an event across polls by (event_id, round, heat)."""
+    return event.get("event_id"), event.get("round"), event.get("heat")
+
+
+def diff_events(previous, current):
+    """
+    Compare two snapshots ({event_key: event}) and return the events in
+    `current` that are new or whose contents changed since `previous`.
+    """
+    changes = []
+    for key, event in current.items():
+        old = previous.get(key)
+        if old is None:
+            changes.append({"change": "added", "event": event})
+        elif old != event:
+            changes.append({"change": "changed", "event": event})
+    return changes
+
+
+def format_sse(event_type, payload):
+    """Serialize one Server-Sent Events message."""
+    return f"event: {event_type}\ndata: {json.dumps(payload)}\n\n"
+
+
+# ---------- Watcher ---------- #
+
+class MeetWatcher:
+    """
+    Poll a single meet page on a schedule and fan out event-level changes.
+
+    One watcher exists per meet URL, so N subscribers share a single upstream
+    poll. Each message is serialized once and pushed to every subscriber queue.
+    """
+
+    def __init__(self, meet_url: str, interval: float = POLL_INTERVAL):
+        self.meet_url = meet_url
+        self.interval = interval
+        self.subscribers = set()
+        self.snapshot = {}
+        self.meet_info = None
+        self._task = None
+
+    def subscribe(self) -> asyncio.Queue:
+        """Register a subscriber and start polling if this is the first one."""
+        queue = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        self.subscribers.add(queue)
+
+        # Late joiners start from the latest full snapshot
+        if self.meet_info is not None:
+            queue.put_nowait(self._snapshot_message())
+
+        if self._task is None:
+            logger.info(f"Starting watch on {self.meet_url} (every {self.interval:.0f}s)")
+            self._task = asyncio.create_task(self._run())
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue):
+        """Remove a subscriber and stop polling once nobody is listening."""
+        self.subscribers.discard(queue)
+        if not self.subscribers and self._task is not None:
+            logger.info(f"Stopping watch on {self.meet_url} (no subscribers)")
+            self._task.cancel()
+            self._task = None
+
+    async def _run(self):
+        while True:
+            start = time.time()
+            try:
+                # Cached for half an interval so watchers of this meet in other workers share the poll
+                data = await asyncio.to_thread(
+                    cached_scrape, f"watch:{self.meet_url}", self.interval / 2, get_meet_results, self.meet_url
+                )
+            except Exception as e:
+                logger.error(f"Watch poll failed for {self.meet_url}: {e}")
+                self._publish(format_sse("error", {"detail": str(e)}))
+                data = None
+
+            if data:
+                self._apply(data)
+
+            await asyncio.sleep(max(0.0, self.interval - (time.time() - start)))
+
+    def _apply(self, data):
+        current = {event_key(e): e for e in data.get("events", [])}
+        first_poll = self.meet_info is None
+
+        self.meet_info = {k: v for k, v in data.items() if k != "events"}
+        changes = diff_events(self.snapshot, current)
+        self.snapshot = current
+
+        if first_poll:
+            self._publish(self._snapshot_message())
+        elif changes:
+            logger.info(f"{len(changes)} event(s) updated for {self.meet_url}")
+            self._publish(format_sse("update", {**self.meet_info, "changes": changes}))
+
+    def _snapshot_message(self):
+        return format_sse("snapshot", {**self.meet_info, "events": list(self.snapshot.values())})
+
+    def _publish(self, message):
+        for queue in list(self.subscribers):
+            try:
+                queue.put_nowait(message)
+            except asyncio.QueueFull:
+                # Subscriber fell behind: drop its backlog and resync with a full snapshot
+                logger.warning(f"Subscriber fell behind on {self.meet_url}; resyncing")
+                while not queue.empty():
+                    queue.get_nowait()
+                if self.meet_info is not None:
+                    queue.put_nowait(self._snapshot_message())
+
+
+# ---------- Registry ---------- #
+
+_watchers = {}
+
+def get_watcher(meet_url: str) -> MeetWatcher:
+    """Return the shared watcher for a meet URL, creating it if needed."""
+    watcher = _watchers.get(meet_url)
+    if watcher is None:
+        watcher = _watchers[meet_url] = MeetWatcher(meet_url)
+    return watcher
+
+
+def release_watcher(watcher: MeetWatcher, queue: asyncio.Queue):
+    """Unsubscribe a queue and forget the watcher once it has no subscribers."""
+    watcher.unsubscribe(queue)
+    if not watcher.subscribers:
+        _watchers.pop(watcher.meet_url, None)
@@ -0,0 +1,116 @@
+import gzip
+import hashlib
+import os
+import threading
+import time
+from utils.db import connect
+from utils.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# Every successfully fetched page is kept here (PAGE_ARCHIVE=0 turns it off):
+#   objects/<2 hex>/<62 hex>.gz  gzip-compressed raw bytes, named by their SHA-256
+#   index.db                     (url, kind, fetched_at, sha256, charset, size) per fetch
+# Identical pages are stored once however often they are fetched.
+PAGE_ARCHIVE = os.getenv("PAGE_ARCHIVE", "1") == "1"
+PAGE_ARCHIVE_DIR = os.getenv("PAGE_ARCHIVE_DIR", os.path.join("data", "archive"))
+
+
+class PageArchive:
+    """Content-addressed store of raw fetched pages, indexed by URL and fetch time."""
+
+    def __init__(self, root: str = PAGE_ARCHIVE_DIR):
+        self.root = root
+        self._lock = threading.Lock()
+        self._conn = None
+
+    def _ensure_open(self):
+        if self._conn is not None:
+            return
+        conn = connect(os.path.join(self.root, "index.db"))
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS pages ("
+            "url TEXT NOT NULL, kind TEXT NOT NULL, fetched_at REAL NOT NULL, "
+            "sha256 TEXT NOT NULL, charset TEXT, size INTEGER NOT NULL, "
+            "PRIMARY KEY (url, fetched_at))"
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS pages_kind ON pages (kind, url, fetched_at)")
+        conn.commit()
+        self._conn = conn
+
+    def _object_path(self, sha256: str) -> str:
+        return os.path.join(self.root, "objects", sha256[:2], sha256[2:] + ".gz")
+
+    def put(self, kind: str, url: str, markup: bytes, charset: str | None = None, fetched_at: float | None = None) -> str:
+        """Store one fetch of `url`; returns the page's SHA-256."""
+        sha256 = hashlib.sha256(markup).hexdigest()
+        path = self._object_path(sha256)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # Write-then-rename, so concurrent writers and readers never see a partial object
+            tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(gzip.compress(markup, compresslevel=6, mtime=0))
+            os.replace(tmp_path, path)
+
+        with self._lock:
+            self._ensure_open()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO pages (url, kind, fetched_at, sha256, charset, size) VALUES (?, ?, ?, ?, ?, ?)",
+                (url, kind, fetched_at or time.time(), sha256, charset, len(markup)),
+            )
+            self._conn.commit()
+        return sha256
+
+    def get(self, sha256: str) -> bytes:
+        """Raw page bytes for a stored SHA-256."""
+        with open(self._object_path(sha256), "rb") as f:
+            return gzip.decompress(f.read())
+
+    def latest(self, kind: str | None = None, since: float | None = None) -> list:
+        """
+        The most recent fetch of every archived URL, optionally only of one
+        kind and fetched at or after `since`, as dicts ordered by URL.
+        """
+        clauses, params = [], []
+        if kind:
+            clauses.append("kind = ?")
+            params.append(kind)
+        if since:
+            clauses.append("fetched_at >= ?")
+            params.append(since)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+
+        with self._lock:
+            self._ensure_open()
+            rows = self._conn.execute(
+                "SELECT url, kind, MAX(fetched_at), sha256, charset, size "
+                f"FROM pages {where} GROUP BY url ORDER BY url",
+                params,
+            ).fetchall()
+        return [
+            {"url": url, "kind": kind, "fetched_at": fetched_at, "sha256": sha256, "charset": charset, "size": size}
+            for url, kind, fetched_at, sha256, charset, size in rows
+        ]
+
+    def history(self, url: str) -> list:
+        """Every archived fetch of one URL, oldest first."""
+        with self._lock:
+            self._ensure_open()
+            rows = self._conn.execute(
+                "SELECT fetched_at, sha256, size FROM pages WHERE url = ? ORDER BY fetched_at", (url,)
+            ).fetchall()
+        return [{"fetched_at": fetched_at, "sha256": sha256, "size": size} for fetched_at, sha256, size in rows]
+
+
+page_archive = PageArchive()
+
+
+def archive_page(kind: str, url: str, r, markup: bytes, charset: str | None):
+    """Archive a fetched page if the fetch succeeded; never raises."""
+    if not PAGE_ARCHIVE or getattr(r, "status_code", 200) != 200 or not markup:
+        return
+    try:
+        page_archive.put(kind, url, markup, charset)
+    except Exception as e:
+        logger.warning("Failed to archive %s: %s", url, e)
@@ -0,0 +1,24 @@
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from utils.logging_config import pool_logging_kwargs
+
+# Worker processes for CPU-bound page parsing (0 = parse in the calling thread).
+# BeautifulSoup holds the GIL while building trees, so only processes give
+# truly parallel parsing; each API worker gets its own pool. The default (0)
+# parses under the GIL, so concurrent requests get no parallel speedup.
+PARSE_PROCESSES = int(os.getenv("PARSE_PROCESSES", "0"))
+
+_parse_pool = None
+_parse_pool_lock = threading.Lock()
+
+
+def get_parse_pool() -> ProcessPoolExecutor | None:
+    """Return the shared parse process pool, or None when PARSE_PROCESSES is 0."""
+    global _parse_pool
+    if PARSE_PROCESSES <= 0:
+        return None
+    with _parse_pool_lock:
+        if _parse_pool is None:
+            _parse_pool = ProcessPoolExecutor(max_workers=PARSE_PROCESSES, **pool_logging_kwargs())
+        return _parse_pool
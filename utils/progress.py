@@ -0,0 +1,29 @@
+import contextvars
+from contextlib import contextmanager
+
+# Progress reporting for long-running scrapes. Parsers call `advance("events")`
+# as they go; it costs one ContextVar lookup when nobody is listening. A job
+# runner installs a reporter for the duration of its scrape with `reporting_to`.
+_reporter = contextvars.ContextVar("progress_reporter", default=None)
+
+
+def advance(counter: str, n: int = 1):
+    """Count `n` more units of `counter` (e.g. "events") for the current job, if any."""
+    reporter = _reporter.get()
+    if reporter is not None:
+        reporter(counter, n)
+
+
+@contextmanager
+def reporting_to(reporter):
+    """Send `advance` calls made in this context to `reporter(counter, n)`."""
+    token = _reporter.set(reporter)
+    try:
+        yield
+    finally:
+        _reporter.reset(token)
+
+
+def submit_in_context(pool, fn, *args):
+    """`pool.submit` that carries the caller's progress reporter into the worker thread."""
+    return pool.submit(contextvars.copy_context().run, fn, *args)
@@ -0,0 +1,98 @@
+"""
+Re-run the current parsers over the raw page archive, without touching the network.
+
+Parsing fans out over worker processes (one per core by default); the parent
+feeds every result through the same ingest hooks as a live scrape, so the
+roster and search indexes pick up parser fixes, and can also write the
+results to an NDJSON file for inspection or loading elsewhere.
+
+    python -m utils.reparse [--kind meet|athlete|team] [--since 2025-01-01]
+                            [--processes N] [--output reparsed.ndjson] [--no-ingest]
+"""
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from utils.logging_config import get_logger, pool_logging_kwargs
+from utils.page_archive import page_archive
+
+logger = get_logger(__name__)
+
+
+def parse_archived(page: dict) -> dict:
+    """Parse one archived page with the current parser for its kind (runs in a worker process)."""
+    try:
+        markup = page_archive.get(page["sha256"])
+        if page["kind"] == "meet":
+            from scrapers.getMeetDetails import parse_meet_page
+            data = parse_meet_page(page["url"], markup, page["charset"])
+        elif page["kind"] == "athlete":
+            from scrapers.getAthleteDetails import parse_athlete_page
+            data = parse_athlete_page(markup, page["charset"])
+        elif page["kind"] == "team":
+            from scrapers.getTeamRoster import parse_team_page
+            data = parse_team_page(page["url"], markup, page["charset"])
+        else:
+            raise ValueError(f"Unknown page kind '{page['kind']}'")
+        return {**page, "data": data}
+    except Exception as e:
+        return {**page, "error": f"{type(e).__name__}: {e}"}
+
+
+def ingest(page: dict):
+    from utils.ingest import ingest_athlete, ingest_meet, ingest_roster
+    hooks = {"meet": ingest_meet, "athlete": ingest_athlete, "team": ingest_roster}
+    hooks[page["kind"]](page["url"], page["data"])
+
+
+def reparse(kind=None, since=None, processes=None, output=None, feed_indexes=True) -> dict:
+    """Re-parse the latest archived fetch of every URL; returns counts."""
+    pages = page_archive.latest(kind, since)
+    processes = processes or os.cpu_count() or 1
+    logger.info("Re-parsing %s archived pages on %s processes", len(pages), processes)
+
+    start = time.time()
+    counts = {"pages": len(pages), "parsed": 0, "empty": 0, "failed": 0}
+    out = open(output, "w", encoding="utf-8") if output else None
+    try:
+        with ProcessPoolExecutor(max_workers=processes, **pool_logging_kwargs()) as pool:
+            # Chunks amortize the pickling round trip; results stream back in order
+            for page in pool.map(parse_archived, pages, chunksize=16):
+                if "error" in page:
+                    counts["failed"] += 1
+                    logger.warning("Re-parse failed for %s: %s", page["url"], page["error"])
+                elif not page["data"]:
+                    counts["empty"] += 1
+                else:
+                    counts["parsed"] += 1
+                    if feed_indexes:
+                        ingest(page)
+                if out:
+                    out.write(json.dumps(page, ensure_ascii=False) + "\n")
+    finally:
+        if out:
+            out.close()
+
+    counts["seconds"] = round(time.time() - start, 2)
+    logger.info("Re-parse finished: %s", counts)
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--kind", choices=["meet", "athlete", "team"], help="only re-parse this kind of page")
+    parser.add_argument("--since", help="only pages fetched on or after this date (YYYY-MM-DD)")
+    parser.add_argument("--processes", type=int, help="worker processes (default: one per core)")
+    parser.add_argument("--output", help="write every parsed page to this NDJSON file")
+    parser.add_argument("--no-ingest", action="store_true", help="do not feed results into the local indexes")
+    args = parser.parse_args()
+
+    since = datetime.fromisoformat(args.since).timestamp() if args.since else None
+    counts = reparse(args.kind, since, args.processes, args.output, feed_indexes=not args.no_ingest)
+    print(json.dumps(counts))
+
+
+if __name__ == "__main__":
+    main()
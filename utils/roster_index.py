@@ -0,0 +1,141 @@
+import re
+import threading
+import time
+from collections import defaultdict
+from utils.common import extract_team_slug
+from utils.db import DB_PATH, INDEX_REFRESH_INTERVAL, connect
+from utils.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+
+class RosterIndex:
+    """
+    Bidirectional team slug <-> athlete ID index.
+
+    Lookups are served from in-memory dicts of sets (O(1)); every new pair is
+    written through to SQLite so the index survives restarts. The table is
+    loaded lazily on first use, and pairs added by other worker processes
+    are picked up every INDEX_REFRESH_INTERVAL seconds (by rowid).
+    """
+
+    def __init__(self, db_path: str = DB_PATH):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._conn = None
+        self._team_athletes = defaultdict(set)
+        self._athlete_teams = defaultdict(set)
+        self._last_rowid = 0
+        self._refreshed_at = 0.0
+
+    def _ensure_loaded(self):
+        if self._conn is not None:
+            if time.monotonic() - self._refreshed_at >= INDEX_REFRESH_INTERVAL:
+                self._load_new_rows()
+            return
+        conn = connect(self.db_path)
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS team_athletes ("
+            "team_slug TEXT NOT NULL, athlete_id TEXT NOT NULL, "
+            "PRIMARY KEY (team_slug, athlete_id))"
+        )
+        conn.commit()
+        self._conn = conn
+        self._load_new_rows()
+        logger.info(f"Loaded roster index ({len(self._team_athletes)} teams, {len(self._athlete_teams)} athletes)")
+
+    def _load_new_rows(self):
+        """Read pairs written since the last load, by this or any other worker (rowids only grow)."""
+        rows = self._conn.execute(
+            "SELECT rowid, team_slug, athlete_id FROM team_athletes WHERE rowid > ? ORDER BY rowid",
+            (self._last_rowid,),
+        ).fetchall()
+        for _, team_slug, athlete_id in rows:
+            self._team_athletes[team_slug].add(athlete_id)
+            self._athlete_teams[athlete_id].add(team_slug)
+        if rows:
+            self._last_rowid = rows[-1][0]
+        self._refreshed_at = time.monotonic()
+
+    def add(self, pairs):
+        """Record (team_slug, athlete_id) pairs; returns the number of new pairs."""
+        with self._lock:
+            self._ensure_loaded()
+            new_pairs = set()
+            for team_slug, athlete_id in pairs:
+                if not team_slug or not athlete_id:
+                    continue
+                athlete_id = str(athlete_id)
+                if athlete_id in self._team_athletes.get(team_slug, ()):
+                    continue
+                new_pairs.add((team_slug, athlete_id))
+
+            if not new_pairs:
+                return 0
+
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO team_athletes (team_slug, athlete_id) VALUES (?, ?)", new_pairs
+            )
+            self._conn.commit()
+            for team_slug, athlete_id in new_pairs:
+                self._team_athletes[team_slug].add(athlete_id)
+                self._athlete_teams[athlete_id].add(team_slug)
+            return len(new_pairs)
+
+    def athletes_for_team(self, team_slug: str) -> list:
+        """All athlete IDs that have ever appeared for a team slug."""
+        with self._lock:
+            self._ensure_loaded()
+            return sorted(self._team_athletes.get(team_slug, ()))
+
+    def teams_for_athlete(self, athlete_id) -> list:
+        """All team slugs an athlete has appeared for."""
+        with self._lock:
+            self._ensure_loaded()
+            return sorted(self._athlete_teams.get(str(athlete_id), ()))
+
+
+roster_index = RosterIndex()
+
+
+# ---------- Scrape Feeders ---------- #
+
+def index_roster(team_url: str, data):
+    """Feed a `get_team_roster` result into the index."""
+    team_slug = extract_team_slug(team_url)
+    if not data or not team_slug:
+        return
+    try:
+        added = roster_index.add((team_slug, a.get("athlete_id")) for a in data.get("roster", []))
+        logger.debug(f"Indexed roster {team_slug}: {added} new pairs")
+    except Exception as e:
+        logger.warning(f"Failed to index roster {team_slug}: {e}")
+
+
+def index_athlete(athlete_url: str, data):
+    """Feed a `get_athlete_details` result (current + previous teams) into the index."""
+    match = re.search(r"/athletes/(\d+)", athlete_url or "")
+    if not data or not match:
+        return
+    athlete_id = match.group(1)
+    team_slugs = [data.get("current_team_slug"), *data.get("previous_team_slugs", [])]
+    try:
+        added = roster_index.add((slug, athlete_id) for slug in team_slugs)
+        logger.debug(f"Indexed athlete {athlete_id}: {added} new pairs")
+    except Exception as e:
+        logger.warning(f"Failed to index athlete {athlete_id}: {e}")
+
+
+def index_meet(data):
+    """Feed every result row of a `get_meet_results` result into the index."""
+    if not data:
+        return
+    try:
+        added = roster_index.add(
+            (row.get("team_slug"), row.get("athlete_id"))
+            for event in data.get("events", [])
+            for row in event.get("results", [])
+        )
+        logger.debug(f"Indexed meet {data.get('meet_name')}: {added} new pairs")
+    except Exception as e:
+        logger.warning(f"Failed to index meet {data.get('meet_name')}: {e}")
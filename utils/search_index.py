@@ -0,0 +1,373 @@
+import heapq
+import json
+import math
+import re
+import threading
+import time
+import unicodedata
+from collections import Counter, defaultdict
+from itertools import islice
+from utils.common import extract_meet_id, extract_team_slug
+from utils.db import DB_PATH, INDEX_REFRESH_INTERVAL, connect
+from utils.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# Field holding the display name and the ID for each searchable kind
+SEARCH_FIELDS = {
+    "athlete": ("athlete_name", "athlete_id"),
+    "team": ("team_name", "team_slug"),
+    "meet": ("meet_name", "meet_id"),
+}
+
+# Share of query trigrams a name must contain to count as a match
+MIN_SIMILARITY = 0.5
+
+# Number of leading trigram matches re-ranked by edit distance
+RERANK_DEPTH = 20
+
+# Edit-distance similarity (see `name_similarity`) a local hit needs before
+# /search trusts the index instead of asking TFRRS; 0.8 allows about one typo
+# per five characters, while a shared first or last name alone scores ~0.6
+CONFIDENT_SIMILARITY = 0.8
+
+# Queries shorter than this (after normalizing) are not answered locally
+MIN_QUERY_LENGTH = 2
+
+# Bounds per query on unselective input (short prefixes, common names):
+# posting entries read, rarest lists first, and entries then scored exactly
+MAX_POSTINGS = 5000
+MAX_CANDIDATES = 500
+
+
+# ---------- Text Helpers ---------- #
+
+def normalize(text: str) -> str:
+    """Lowercase, strip accents and punctuation, and collapse whitespace."""
+    text = unicodedata.normalize("NFKD", text or "")
+    text = "".join(c for c in text if not unicodedata.combining(c)).lower()
+    return " ".join(re.sub(r"[^a-z0-9]+", " ", text).split())
+
+
+def trigrams(text: str, prefix: bool = False) -> set:
+    """
+    Word-level trigrams padded at both ends ('  ni', ' ni', ..., 'co ').
+    With prefix=True the last word is left open-ended so partial words match.
+    """
+    words = normalize(text).split()
+    grams = set()
+    for i, word in enumerate(words):
+        open_ended = prefix and i == len(words) - 1
+        padded = "  " + word + ("" if open_ended else " ")
+        grams.update(padded[j:j + 3] for j in range(len(padded) - 2))
+    return grams
+
+
+def edit_distance(a: str, b: str) -> int:
+    """
+    Optimal string alignment distance (Levenshtein plus adjacent transpositions).
+    Bit-parallel (Hyyrö 2003): one column of the DP matrix per character of
+    `b`, held as bit vectors over `a`; this loop dominates query time.
+    """
+    if not a:
+        return len(b)
+    full = (1 << len(a)) - 1
+    last = 1 << (len(a) - 1)
+    match = {}
+    for i, c in enumerate(a):
+        match[c] = match.get(c, 0) | (1 << i)
+
+    distance, vp, vn, d0, pm_prev = len(a), full, 0, 0, 0
+    for c in b:
+        pm = match.get(c, 0)
+        tr = ((~d0 & pm) << 1) & pm_prev
+        d0 = ((((pm & vp) + vp) ^ vp) | pm | vn | tr) & full
+        hp = (vn | ~(d0 | vp)) & full
+        hn = d0 & vp
+        if hp & last:
+            distance += 1
+        elif hn & last:
+            distance -= 1
+        hp = (hp << 1) | 1
+        hn = hn << 1
+        vp = (hn | ~(d0 | hp)) & full
+        vn = hp & d0
+        pm_prev = pm
+    return distance
+
+
+def name_similarity(needle: str, name: str, whole_words: bool = False) -> float:
+    """
+    Edit-distance similarity (0-1) between a normalized query and a normalized name.
+    Also compares against the name's prefix and its word-sorted form, so
+    partial input and "Last First" ordering are not penalized. With
+    `whole_words`, the prefix only counts when it ends on a word boundary
+    ("nico young" matches "nico young jr" but not "nico youngblood").
+    """
+    pairs = [(needle, name)]
+    if not whole_words or name[len(needle):len(needle) + 1] in ("", " "):
+        pairs.append((needle, name[:len(needle)]))
+    if " " in needle:
+        pairs.append((" ".join(sorted(needle.split())), " ".join(sorted(name.split()))))
+
+    best = 0.0
+    for candidate, target in pairs:
+        longest = max(len(candidate), len(target)) or 1
+        best = max(best, 1 - edit_distance(candidate, target) / longest)
+    return best
+
+
+def is_confident_match(kind: str, query: str, record: dict) -> bool:
+    """Whether a search hit is close enough to `query` to answer without a live search."""
+    name_field, _ = SEARCH_FIELDS[kind]
+    similarity = name_similarity(normalize(query), normalize(record.get(name_field)), whole_words=True)
+    return similarity >= CONFIDENT_SIMILARITY
+
+
+# ---------- Index ---------- #
+
+class SearchIndex:
+    """
+    Local trigram index over every athlete, team and meet name we have scraped.
+
+    Records keep the same shape as `search_tfrrs` results. Matching is
+    typo-tolerant (trigram overlap) and prefix-aware; everything is held in
+    memory and written through to SQLite. Entries added or updated by other
+    worker processes are picked up every INDEX_REFRESH_INTERVAL seconds.
+    """
+
+    def __init__(self, db_path: str = DB_PATH):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._conn = None
+        self._records = {kind: {} for kind in SEARCH_FIELDS}
+        self._grams = {kind: {} for kind in SEARCH_FIELDS}
+        self._names = {kind: {} for kind in SEARCH_FIELDS}
+        self._postings = {kind: defaultdict(set) for kind in SEARCH_FIELDS}
+        self._last_rowid = 0
+        self._refreshed_at = 0.0
+
+    def _ensure_loaded(self):
+        if self._conn is not None:
+            if time.monotonic() - self._refreshed_at >= INDEX_REFRESH_INTERVAL:
+                self._load_new_rows()
+            return
+        conn = connect(self.db_path)
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS search_entries ("
+            "kind TEXT NOT NULL, entry_id TEXT NOT NULL, record TEXT NOT NULL, "
+            "PRIMARY KEY (kind, entry_id))"
+        )
+        conn.commit()
+        self._conn = conn
+        self._load_new_rows()
+        logger.info(f"Loaded search index ({sum(len(r) for r in self._records.values())} entries)")
+
+    def _load_new_rows(self):
+        """
+        Read entries written since the last load, by this or any other worker.
+        INSERT OR REPLACE gives a replaced entry a new, higher rowid, so updates are seen too.
+        """
+        rows = self._conn.execute(
+            "SELECT rowid, kind, entry_id, record FROM search_entries WHERE rowid > ? ORDER BY rowid",
+            (self._last_rowid,),
+        ).fetchall()
+        for _, kind, entry_id, record in rows:
+            record = json.loads(record)
+            if kind in self._records and self._records[kind].get(entry_id) != record:
+                self._store(kind, entry_id, record)
+        if rows:
+            self._last_rowid = rows[-1][0]
+        self._refreshed_at = time.monotonic()
+
+    def _store(self, kind, entry_id, record):
+        name_field, _ = SEARCH_FIELDS[kind]
+        postings = self._postings[kind]
+        for gram in self._grams[kind].get(entry_id, ()):
+            postings[gram].discard(entry_id)
+
+        name = normalize(record.get(name_field))
+        grams = trigrams(name)
+        for gram in grams:
+            postings[gram].add(entry_id)
+        self._grams[kind][entry_id] = grams
+        self._names[kind][entry_id] = name
+        self._records[kind][entry_id] = record
+
+    def add(self, kind: str, records):
+        """Insert or merge records; fields already known are not overwritten with None."""
+        name_field, id_field = SEARCH_FIELDS[kind]
+        with self._lock:
+            self._ensure_loaded()
+            updates = {}
+            for record in records:
+                entry_id = record.get(id_field)
+                if not entry_id or not record.get(name_field):
+                    continue
+                entry_id = str(entry_id)
+                fields = {k: v for k, v in record.items() if v is not None}
+                existing = self._records[kind].get(entry_id, {})
+                if {**existing, **fields} != existing:
+                    updates[entry_id] = {**updates.get(entry_id, {}), **fields}
+
+            if not updates:
+                return 0
+
+            # The in-memory copy may lag other workers by INDEX_REFRESH_INTERVAL, so
+            # merge against the stored row, holding the write lock from read to replace
+            changed = {}
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                for entry_id, fields in updates.items():
+                    row = self._conn.execute(
+                        "SELECT record FROM search_entries WHERE kind = ? AND entry_id = ?", (kind, entry_id)
+                    ).fetchone()
+                    stored = json.loads(row[0]) if row else {}
+                    merged = {**stored, **fields}
+                    if merged != stored:
+                        changed[entry_id] = merged
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO search_entries (kind, entry_id, record) VALUES (?, ?, ?)",
+                    [(kind, entry_id, json.dumps(record)) for entry_id, record in changed.items()],
+                )
+                self._conn.commit()
+            except Exception:
+                self._conn.rollback()
+                raise
+            for entry_id, record in changed.items():
+                self._store(kind, entry_id, record)
+            return len(changed)
+
+    def search(self, kind: str, query: str, limit: int = 50) -> list:
+        """Return records ranked by similarity to `query` (best first)."""
+        grams = trigrams(query, prefix=True)
+        if len(normalize(query)) < MIN_QUERY_LENGTH or not grams:
+            return []
+        needed = math.ceil(len(grams) * MIN_SIMILARITY)
+
+        with self._lock:
+            self._ensure_loaded()
+            postings = self._postings[kind]
+            entry_grams = self._grams[kind]
+            names = self._names[kind]
+
+            # A name sharing `needed` grams must appear in one of the
+            # len(grams) - needed + 1 rarest posting lists, so only those are read
+            # (at most MAX_POSTINGS entries); the names hit most often are scored exactly
+            lists = sorted((postings.get(gram, ()) for gram in grams), key=len)
+            hits, budget = Counter(), MAX_POSTINGS
+            for posting in lists[:len(grams) - needed + 1]:
+                if len(posting) > budget:
+                    hits.update(islice(posting, budget))
+                    break
+                hits.update(posting)
+                budget -= len(posting)
+
+            scored = []
+            for entry_id, _ in hits.most_common(MAX_CANDIDATES):
+                shared = len(grams & entry_grams[entry_id])
+                if shared >= needed:
+                    scored.append((shared / len(grams), 2 * shared / (len(grams) + len(entry_grams[entry_id])), entry_id))
+
+            # Trigram overlap (containment, then Dice) orders all matches
+            top = heapq.nlargest(limit, scored)
+            top_names = {entry_id: names[entry_id] for _, _, entry_id in top[:RERANK_DEPTH]}
+            records = {entry_id: dict(self._records[kind][entry_id]) for _, _, entry_id in top}
+
+        # The head is re-ranked by edit distance (typos, transpositions) outside the lock
+        needle = normalize(query)
+        head = sorted(
+            top[:RERANK_DEPTH],
+            key=lambda s: 0.3 * s[0] + 0.7 * name_similarity(needle, top_names[s[2]]),
+            reverse=True,
+        )
+        return [records[entry_id] for _, _, entry_id in head + top[RERANK_DEPTH:]]
+
+    def records(self, kind: str) -> list:
+        """Every record of one kind, unranked."""
+        with self._lock:
+            self._ensure_loaded()
+            return [dict(record) for record in self._records[kind].values()]
+
+
+search_index = SearchIndex()
+
+
+# ---------- Scrape Feeders ---------- #
+
+def _safe_add(kind, records, source):
+    try:
+        added = search_index.add(kind, records)
+        logger.debug(f"Indexed {added} {kind} name(s) from {source}")
+    except Exception as e:
+        logger.warning(f"Failed to index {kind} names from {source}: {e}")
+
+
+def index_search_results(query_type: str, results):
+    """Feed live `search_tfrrs` results into the index."""
+    _safe_add(query_type, results or [], f"{query_type} search")
+
+
+def index_roster_names(team_url: str, data):
+    """Feed a `get_team_roster` result (team + roster athletes) into the index."""
+    team_slug = extract_team_slug(team_url)
+    if not data or not team_slug:
+        return
+    _safe_add("team", [{"team_name": data.get("team_name"), "team_slug": team_slug}], team_url)
+    _safe_add("athlete", [
+        {
+            "athlete_name": a.get("athlete_name"),
+            "athlete_id": a.get("athlete_id"),
+            "team_name": data.get("team_name"),
+            "team_slug": team_slug,
+        }
+        for a in data.get("roster", [])
+    ], team_url)
+
+
+def index_athlete_names(athlete_url: str, data):
+    """Feed a `get_athlete_details` result into the index."""
+    match = re.search(r"/athletes/(\d+)", athlete_url or "")
+    if not data or not match:
+        return
+    _safe_add("athlete", [{
+        "athlete_name": data.get("athlete_name"),
+        "athlete_id": match.group(1),
+        "team_name": data.get("current_team_name"),
+        "team_slug": data.get("current_team_slug"),
+    }], athlete_url)
+    _safe_add("meet", [
+        {
+            "meet_name": r.get("meet_name"),
+            "meet_id": r.get("meet_id"),
+            "date": r.get("date"),
+            "meet_type": r.get("meet_type"),
+        }
+        for r in data.get("results", [])
+    ], athlete_url)
+
+
+def index_meet_names(meet_url: str, data):
+    """Feed a `get_meet_results` result (meet + every athlete and team in it) into the index."""
+    if not data:
+        return
+    _safe_add("meet", [{
+        "meet_name": data.get("meet_name"),
+        "meet_id": extract_meet_id(meet_url),
+        "date": data.get("meet_date"),
+        "meet_type": data.get("meet_type"),
+    }], meet_url)
+
+    rows = [row for event in data.get("events", []) for row in event.get("results", [])]
+    _safe_add("athlete", [
+        {
+            "athlete_name": row.get("athlete_name"),
+            "athlete_id": row.get("athlete_id"),
+            "team_name": row.get("team_name"),
+            "team_slug": row.get("team_slug"),
+        }
+        for row in rows
+    ], meet_url)
+    _safe_add("team", [
+        {"team_name": row.get("team_name"), "team_slug": row.get("team_slug")} for row in rows
+    ], meet_url)
@@ -0,0 +1,218 @@
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from utils.common import http_get
+from utils.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# Hedging: when a fetch has not answered after the recent p95 latency (clamped to
+# [HEDGE_MIN_DELAY, HEDGE_MAX_DELAY]), a duplicate is sent and the first answer wins.
+# At most HEDGE_MAX_RATIO of recent fetches are hedged, so a uniformly slow
+# upstream does not get double the traffic.
+HEDGE_ENABLED = os.getenv("HEDGE_ENABLED", "1") == "1"
+HEDGE_MIN_DELAY = float(os.getenv("HEDGE_MIN_DELAY", "0.25"))
+HEDGE_MAX_DELAY = float(os.getenv("HEDGE_MAX_DELAY", "5"))
+HEDGE_DEFAULT_DELAY = 2.0  # until LATENCY_MIN_SAMPLES latencies are known
+HEDGE_MAX_RATIO = float(os.getenv("HEDGE_MAX_RATIO", "0.1"))
+
+# Circuit breaker: BREAKER_FAILURES consecutive failures open it for
+# BREAKER_COOLDOWN seconds; then a single probe decides whether it closes again
+BREAKER_FAILURES = int(os.getenv("BREAKER_FAILURES", "5"))
+BREAKER_COOLDOWN = float(os.getenv("BREAKER_COOLDOWN", "30"))
+
+LATENCY_WINDOW = 200
+LATENCY_MIN_SAMPLES = 20
+
+_pool = ThreadPoolExecutor(max_workers=int(os.getenv("UPSTREAM_POOL_SIZE", "32")), thread_name_prefix="upstream")
+
+
+class UpstreamUnavailable(Exception):
+    """Raised instead of fetching while a circuit breaker is open."""
+
+    def __init__(self, kind: str, retry_after: float):
+        super().__init__(f"TFRRS {kind} pages are failing; retrying upstream in {retry_after:.0f}s")
+        self.kind = kind
+        self.retry_after = retry_after
+
+
+class UpstreamError(Exception):
+    """Raised for a non-2xx upstream answer, so callers never parse an error page."""
+
+    def __init__(self, kind: str, url: str, status_code: int):
+        super().__init__(f"TFRRS answered {status_code} for {kind} page {url}")
+        self.kind = kind
+        self.status_code = status_code
+
+
+class CircuitBreaker:
+    """Closed -> open after consecutive failures -> half-open (one probe) -> closed."""
+
+    def __init__(self, name: str, failures: int = BREAKER_FAILURES, cooldown: float = BREAKER_COOLDOWN):
+        self.name = name
+        self.failures = failures
+        self.cooldown = cooldown
+        self._lock = threading.Lock()
+        self.state = "closed"
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self.rejected = 0
+        self._probing = False
+
+    def retry_after(self) -> float:
+        return max(0.0, self.opened_at + self.cooldown - time.monotonic())
+
+    def allow(self) -> bool:
+        """Whether a fetch may go upstream now."""
+        with self._lock:
+            if self.state == "open" and self.retry_after() == 0:
+                self.state = "half_open"
+            if self.state == "closed" or (self.state == "half_open" and not self._probing):
+                self._probing = self.state == "half_open"
+                return True
+            self.rejected += 1
+            return False
+
+    def record(self, ok: bool):
+        with self._lock:
+            self._probing = False
+            if ok:
+                self.state, self.consecutive_failures = "closed", 0
+                return
+            self.consecutive_failures += 1
+            if self.state == "half_open" or self.consecutive_failures >= self.failures:
+                if self.state != "open":
+                    logger.warning("Circuit for %s pages opened after %s consecutive failures", self.name, self.consecutive_failures)
+                self.state, self.opened_at = "open", time.monotonic()
+
+
+class UpstreamStats:
+    """Rolling latencies and hedge counters for one kind of page."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.latencies = deque(maxlen=LATENCY_WINDOW)
+        self.recent_hedges = deque(maxlen=LATENCY_WINDOW)
+        self.requests = 0
+        self.hedged = 0
+        self.hedge_wins = 0
+
+    def p95(self) -> float | None:
+        with self._lock:
+            if len(self.latencies) < LATENCY_MIN_SAMPLES:
+                return None
+            ordered = sorted(self.latencies)
+        return ordered[int(len(ordered) * 0.95) - 1]
+
+    def hedge_delay(self) -> float:
+        p95 = self.p95()
+        return HEDGE_DEFAULT_DELAY if p95 is None else min(max(p95, HEDGE_MIN_DELAY), HEDGE_MAX_DELAY)
+
+    def may_hedge(self) -> bool:
+        with self._lock:
+            return sum(self.recent_hedges) < HEDGE_MAX_RATIO * max(len(self.recent_hedges), 1 / HEDGE_MAX_RATIO)
+
+    def record(self, latency: float | None, hedged: bool, hedge_won: bool):
+        with self._lock:
+            self.requests += 1
+            self.hedged += hedged
+            self.hedge_wins += hedge_won
+            self.recent_hedges.append(hedged)
+            if latency is not None:
+                self.latencies.append(latency)
+
+
+_breakers = {}
+_stats = {}
+_registry_lock = threading.Lock()
+
+
+def _for_kind(kind: str):
+    with _registry_lock:
+        if kind not in _breakers:
+            _breakers[kind], _stats[kind] = CircuitBreaker(kind), UpstreamStats()
+        return _breakers[kind], _stats[kind]
+
+
+def _is_failure(r) -> bool:
+    return r.status_code >= 500 or r.status_code == 429
+
+
+# ---------- Fetching ---------- #
+
+def upstream_get(kind: str, url: str, **kwargs):
+    """
+    `http_get` behind the `kind` circuit breaker, hedged after the recent p95.
+
+    Raises UpstreamUnavailable without touching the network while the breaker
+    is open, and UpstreamError for any non-2xx answer (only 5xx/429 count as
+    breaker failures). Latency is measured from the primary fetch's start, so
+    a hedged fetch records what the caller waited. A losing fetch cannot be
+    cancelled mid-flight and finishes in the background.
+    """
+    breaker, stats = _for_kind(kind)
+    if not breaker.allow():
+        raise UpstreamUnavailable(kind, breaker.retry_after())
+
+    start = time.monotonic()
+    primary = _pool.submit(http_get, url, **kwargs)
+    futures = [primary]
+    hedged = False
+    if HEDGE_ENABLED and breaker.state == "closed" and stats.may_hedge():
+        done, _ = wait(futures, timeout=stats.hedge_delay())
+        if not done:
+            logger.debug("Hedging slow %s fetch: %s", kind, url)
+            futures.append(_pool.submit(http_get, url, **kwargs))
+            hedged = True
+
+    # First non-failing answer wins; an error or 5xx waits for the other attempt
+    pending, best, error = set(futures), None, None
+    while pending:
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            try:
+                r = future.result()
+            except Exception as e:
+                error = e
+                continue
+            if best is None or _is_failure(best[0]):
+                best = (r, time.monotonic() - start, future is not primary)
+        if best is not None and not _is_failure(best[0]):
+            break
+
+    if best is None:
+        breaker.record(False)
+        stats.record(None, hedged, False)
+        raise error
+
+    r, latency, hedge_won = best
+    breaker.record(not _is_failure(r))
+    stats.record(latency, hedged, hedge_won)
+    if not 200 <= r.status_code < 300:
+        raise UpstreamError(kind, url, r.status_code)
+    return r
+
+
+def upstream_status() -> dict:
+    """Breaker state, latency and hedge counters per kind of page (this worker process only)."""
+    status = {}
+    with _registry_lock:
+        kinds = list(_breakers)
+    for kind in kinds:
+        breaker, stats = _for_kind(kind)
+        p95 = stats.p95()
+        status[kind] = {
+            "breaker": breaker.state,
+            "consecutive_failures": breaker.consecutive_failures,
+            "retry_after": round(breaker.retry_after(), 1) if breaker.state == "open" else 0,
+            "rejected": breaker.rejected,
+            "requests": stats.requests,
+            "p95_seconds": round(p95, 3) if p95 is not None else None,
+            "hedge_delay_seconds": round(stats.hedge_delay(), 3),
+            "hedged": stats.hedged,
+            "hedge_wins": stats.hedge_wins,
+            "hedge_win_rate": round(stats.hedge_wins / stats.hedged, 3) if stats.hedged else None,
+        }
+    return {"pid": os.getpid(), "kinds": status}